@@ -1,8 +1,6 @@
 import os
 import csv
 import random
-import yt_dlp
-from youtubesearchpython import VideosSearch
 
 from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List
 if TYPE_CHECKING:
@@ -13,9 +11,58 @@ if TYPE_CHECKING:
     from Player import HumanPlayer
 
 from ..imports import *
+from ..music.catalog import PlaylistCatalog
+from ..music.song import Song
+from ..music.outbox import Outbox
+from ..music.audio_cache import AudioCache
+from ..music.tracks import fetch_song, song_basename
+from ..music.selection import SongSelector
+from ..music.song_writer import SongWriteQueue, parse_song_entry
+from ..music.backends import get_playback_backend
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+
+def request_song_playback(player: "HumanPlayer", song_title: str, artist: str) -> list[Message]:
+    """
+    Plays a song for a player, fetching its audio in the background if it isn't saved locally yet.
+
+    If the song is in the AudioCache (in any format), a SoundMessage is returned right away. Otherwise the
+    search and download are handed to the DownloadManager (sharing any download of the same song
+    already in progress), a 'fetching' message is returned immediately, and the SoundMessage is
+    queued in the player's Outbox once the file is ready. The file being played is marked as playing in
+    the cache so it is not evicted while the player listens to it.
+
+    Parameters:
+        player (HumanPlayer): The player the song is played for.
+        song_title (str): Title of the song.
+        artist (str): Artist of the song.
+
+    Returns:
+        list[Message]: A SoundMessage, or a ServerMessage saying the song is being fetched.
+    """
+    cache = AudioCache.get_instance()
+    filename = cache.find(song_basename(song_title, artist))
+    if filename is not None:
+        print(f"{filename} already exists. Skipping download.")
+        cache.mark_playing(player, filename)
+        return [SoundMessage(player, filename)]
+
+    def deliver(future) -> None:
+        outbox = Outbox.get_instance()
+        if future.exception() is not None:
+            outbox.post(player, ServerMessage(player, f"Couldn't download '{song_title}': {future.exception()}"))
+        else:
+            cache.mark_playing(player, future.result())
+            outbox.post(player, SoundMessage(player, future.result()))
+
+    future = fetch_song(song_title, artist)
+    if future is None:
+        return [ServerMessage(player, "Too many songs are downloading right now. Try again in a moment!")]
+    future.add_done_callback(deliver)
+    return [ServerMessage(player, f"Fetching '{song_title}' by {artist}... it will play as soon as it's ready.")]
+
+
 # ============================================================
 # MUSIC COMMANDS
 # ============================================================
@@ -23,91 +70,62 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 class PlaySongCommand(MenuCommand):
     """
     Command to play a selected or random song from the CSV playlist.
-    Downloads song audio if not already saved locally.
+    Downloads song audio in the background if not already saved locally.
     """
 
-    def __init__(self, csv_path: str = "../resources/playlists/$ome $exy $ongs 4 U.csv", selected_song: Optional[str] = None):
+    def __init__(
+        self,
+        csv_path: str = "../resources/playlists/$ome $exy $ongs 4 U.csv",
+        selected_song: Optional[str] = None,
+        selected_artist: Optional[str] = None
+    ):
         """
         Initialize with an optional selected song and the path to the playlist CSV.
 
+        Parameters:
+            csv_path (str): Path to the playlist CSV.
+            selected_song (Optional[str]): Title of the song to play, or None for a random song.
+            selected_artist (Optional[str]): Artist of the selected song, used when titles are duplicated.
+
         Preconditions:
             - csv_path must point to a valid CSV file.
-            - selected_song must be a string or None.
+            - selected_song and selected_artist must be strings or None.
         """
         assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a .csv file"
         if selected_song:
             assert isinstance(selected_song, str), "selected_song must be a string"
+        if selected_artist:
+            assert isinstance(selected_artist, str), "selected_artist must be a string"
         self.csv_path = csv_path
         self.selected_song = selected_song
+        self.selected_artist = selected_artist
 
     def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
         Execute the song selection and play the sound.
 
         Returns:
-            list[Message]: Contains a SoundMessage for playback.
+            list[Message]: Contains a SoundMessage for playback, or a message saying the song is being fetched.
         """
         current_dir = os.path.dirname(os.path.abspath(__file__))
         csv_full_path = os.path.join(current_dir, self.csv_path)
 
         assert os.path.exists(csv_full_path), f"CSV path {csv_full_path} does not exist"
 
-        with open(csv_full_path, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)
-            rows = [row for row in reader if row]
+        playlist = PlaylistCatalog.get_instance().get_playlist(csv_full_path)
 
-        assert rows, "No song data available in CSV"
+        assert playlist.songs, "No song data available in CSV"
 
         # Select the song
+        selected: Optional[Song] = None
         if self.selected_song:
-            selected_row = None
-            for row in rows:
-                if row[0].strip().lower() == self.selected_song.strip().lower():
-                    selected_row = row
-                    break
-            if selected_row:
-                song_title = selected_row[0].strip()
-                artist = selected_row[1].strip()
-            else:
-                song_title, artist = random.choice(rows)[0:2]
-        else:
-            song_title, artist = random.choice(rows)[0:2]
+            selected = playlist.find(self.selected_song, self.selected_artist)
+        if selected is None:
+            selected = SongSelector.get(playlist).uniform()
+        song_title, artist = selected.title, selected.artist
 
         player.set_state("last_song", f"{song_title} - {artist}")
-
-        # YouTube search and download
-        query = f"{song_title} {artist} audio"
-        videosSearch = VideosSearch(query, limit=5)
-        result = videosSearch.result()
-        results = cast(Dict[str, Any], result)['result']
-        assert results, f"No results found for query: {query}"
-        chosen_video = results[0]
-        song_url = chosen_video['link']
-
-        sound_dir = os.path.join(BASE_DIR, "resources", "sound")
-        os.makedirs(sound_dir, exist_ok=True)
-
-        wav_filename = f"{song_title} - {artist}.wav"
-        wav_path = os.path.join(sound_dir, wav_filename)
-
-        if not os.path.exists(wav_path):
-            ydl_opts = {
-                'format': 'bestaudio',
-                'outtmpl': os.path.join(sound_dir, f"{song_title} - {artist}"),
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192'
-                }],
-                'ffmpeg_location': r'C:\ffmpeg\bin'
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([song_url])
-        else:
-            print(f"{wav_filename} already exists. Skipping download.")
-
-        return [SoundMessage(player, wav_filename)]
+        return request_song_playback(player, song_title, artist)
 
 
 class LastPlayedSongCommand(MenuCommand):
@@ -139,85 +157,144 @@ class PauseSongCommand(MenuCommand):
         """
         Toggles between pausing and unpausing the song.
         """
-        import pygame
         if PauseSongCommand._paused:
-            pygame.mixer.music.unpause()
+            get_playback_backend().unpause()
             PauseSongCommand._paused = False
             return [ServerMessage(player, "PauseSongCommand: Song unpaused!")]
         else:
-            pygame.mixer.music.pause()
+            get_playback_backend().pause()
             PauseSongCommand._paused = True
             return [ServerMessage(player, "PauseSongCommand: Song paused!")]
 
 
 class SkipSongCommand(MenuCommand):
     """
-    Command to stop the currently playing song.
+    Command to stop the currently playing song, moving on to the next one if the player is shuffling.
     """
 
     def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
-        Immediately stops the song playback.
+        Immediately stops the song playback and plays the next song of the player's shuffle queue, if any.
         """
-        import pygame
-        pygame.mixer.music.stop()
-        return [ServerMessage(player, "SkipSongCommand: Song skipped!")]
+        get_playback_backend().stop()
+        AudioCache.get_instance().stop_playing(player)
+        messages: list[Message] = [ServerMessage(player, "SkipSongCommand: Song skipped!")]
+
+        csv_full_path = player.get_state("shuffle_playlist")
+        if csv_full_path and os.path.exists(csv_full_path):
+            playlist = PlaylistCatalog.get_instance().get_playlist(csv_full_path)
+            if playlist.songs:
+                song = SongSelector.get(playlist).shuffled(player)
+                player.set_state("last_song", f"{song.title} - {song.artist}")
+                messages.extend(request_song_playback(player, song.title, song.artist))
+        return messages
 
 
 class ShuffleSongCommand(MenuCommand):
     """
-    Placeholder command to shuffle songs. Does not currently implement shuffling logic.
+    Command to play the playlist in shuffled order: every song plays once before any song repeats.
+    Each player has their own order, kept by the playlist's SongSelector; the player's "shuffle_playlist"
+    state remembers which playlist they are shuffling, so SkipSongCommand can move on to the next song.
     """
 
+    def __init__(self, csv_path: str = "../resources/playlists/$ome $exy $ongs 4 U.csv"):
+        """
+        Parameters:
+            csv_path (str): Path to the playlist CSV, relative to the commands folder.
+
+        Preconditions:
+            - csv_path must point to a valid CSV file.
+        """
+        assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a .csv file"
+        self.csv_path = csv_path
+
     def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
-        return [ServerMessage(player, "ShuffleSongCommand: Shuffling songs!")]
+        """
+        Plays the next song of the player's shuffle queue.
+
+        Returns:
+            list[Message]: A message naming the song, followed by its SoundMessage or a 'fetching' message.
+        """
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        csv_full_path = os.path.join(current_dir, self.csv_path)
+
+        assert os.path.exists(csv_full_path), f"CSV path {csv_full_path} does not exist"
+
+        playlist = PlaylistCatalog.get_instance().get_playlist(csv_full_path)
+        assert playlist.songs, "No song data available in CSV"
+
+        song = SongSelector.get(playlist).shuffled(player)
+        player.set_state("shuffle_playlist", csv_full_path)
+        player.set_state("last_song", f"{song.title} - {song.artist}")
+        return [ServerMessage(player, f"Shuffling: up next is '{song.title}' by {song.artist}")] + \
+            request_song_playback(player, song.title, song.artist)
 
 
 class AddSongCommand(MenuCommand):
     """
     Command to allow users to add a new song entry to the playlist CSV.
+    The song is queued on the SongWriteQueue, so the file write itself never holds up the game.
+
+    Nothing here waits for the player to type: a command created with an entry adds that song,
+    and one created without shows the expected format. Text typed by a player elsewhere in the
+    game is added with add_entry().
     """
 
     def __init__(
         self,
         csv_path: str = "../resources/playlists/some_song_playlist.csv",
-        prompt: str = ("Enter new song details in the following format:\n"
+        prompt: str = ("To add a song, enter its details in the following format:\n"
                        "title,artist,genre,popularity,userrating\n"
-                       "Example: CN TOWER,Drake,Pop,100,4.5\n> ")
+                       "Example: CN TOWER,Drake,Pop,100,4.5"),
+        entry: Optional[str] = None
     ):
         """
-        Initializes the command with a CSV path and input prompt.
+        Initializes the command with a CSV path and format instructions, and optionally the entry itself.
+
+        Parameters:
+            csv_path (str): Path to the playlist CSV, relative to the project root.
+            prompt (str): Instructions shown when the command has no entry.
+            entry (Optional[str]): The song to add, as "title,artist,genre,popularity,userrating".
 
         Preconditions:
             - csv_path must be a valid path to a CSV file.
         """
         assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a .csv file"
+        if entry is not None:
+            assert isinstance(entry, str), "entry must be a string"
         self.csv_path = csv_path
         self.prompt = prompt
+        self.entry = entry
 
     def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
-        Prompts user for song input and appends it to the playlist if valid.
+        Adds the command's entry to the playlist, or shows the format instructions if it has none.
 
         Returns:
-            list[Message]: Confirmation or error message.
+            list[Message]: Confirmation, error message or instructions.
         """
-        new_entry = input(self.prompt)
-        fields = [field.strip() for field in new_entry.split(',')]
+        if self.entry is None:
+            return [ServerMessage(player, self.prompt)]
+        return self.add_entry(player, self.entry)
 
-        if len(fields) != 5:
-            return [ServerMessage(player, "Invalid input format. Please use: title,genre,popularity,userrating")]
+    def add_entry(self, player: "HumanPlayer", entry: str) -> list[Message]:
+        """
+        Validates a song entered by a player and adds it to the playlist.
+        The song shows up in the playlist immediately; its row is appended to the CSV in the next batch write.
 
+        Parameters:
+            player (HumanPlayer): The player adding the song.
+            entry (str): The song, as "title,artist,genre,popularity,userrating".
+
+        Returns:
+            list[Message]: Confirmation or error message.
+        """
         try:
-            int(fields[3])  # popularity
-            float(fields[4])  # userrating
-        except ValueError:
-            return [ServerMessage(player, "Invalid popularity or userrating value. Popularity must be an integer and userrating a float.")]
+            song = parse_song_entry(entry)
+        except ValueError as e:
+            return [ServerMessage(player, str(e))]
 
         csv_full_path = os.path.join(BASE_DIR, self.csv_path)
+        SongWriteQueue.get_instance().submit(csv_full_path, song)
 
-        with open(csv_full_path, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(fields)
-
-        return [ServerMessage(player, f"Added song: {fields[0]}")]
+        return [ServerMessage(player, f"Added song: {song.title}")]
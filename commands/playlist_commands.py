@@ -3,9 +3,11 @@ import csv
 import random
 
 from .music_commands import *
-from ..custom_computer import CustomComputer
+from ..custom_computer import CustomComputer, ComputerCommand, MenuOptionSource, DictOptionSource, CombinedOptionSource
+from ..music.catalog import IndexedPlaylist, PlaylistCatalog
+from ..music.song import Song
 
-from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List
+from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List, Tuple
 if TYPE_CHECKING:
     from coord import Coord
     from maps.base import Map
@@ -16,43 +18,105 @@ if TYPE_CHECKING:
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
+# ============================================================
+# SONG MENU OPTIONS
+# ============================================================
+
+class SongOptionSource(MenuOptionSource):
+    """
+    Lists the songs of a playlist as menu options, in file order.
+    A PlaySongCommand is only created for the song a player actually selects.
+    Songs are labelled by title, or by "Title - Artist" when several songs share their title,
+    so every song on a page can be told apart and selected.
+
+    Showing a page asks for its labels, then its prefetch candidates, then the selected command,
+    so the last page listed is kept and reused until the playlist changes.
+    """
+
+    def __init__(self, csv_full_path: str):
+        """
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+
+        Preconditions:
+            - csv_full_path must be a valid .csv file path.
+        """
+        assert isinstance(csv_full_path, str) and csv_full_path.endswith(".csv"), "csv_full_path must point to a .csv file"
+        self.csv_full_path = csv_full_path
+        # (playlist, its length, start, stop, songs) of the last page listed
+        self._last_page: Optional[Tuple[IndexedPlaylist, int, int, int, List[Song]]] = None
+
+    def _songs(self, playlist: IndexedPlaylist, start: int, stop: int) -> List[Song]:
+        """
+        Returns the songs listed at positions [start, stop).
+        """
+        return playlist.songs[start:stop]
+
+    def _playlist(self) -> IndexedPlaylist:
+        return PlaylistCatalog.get_instance().get_playlist(self.csv_full_path)
+
+    def _window(self, playlist: IndexedPlaylist, start: int, stop: int) -> List[Song]:
+        """
+        Returns the songs listed at positions [start, stop), from the last page listed when it covers them.
+        """
+        last = self._last_page
+        if last is not None and last[0] is playlist and last[1] == len(playlist) and last[2] <= start and stop <= last[3]:
+            return last[4][start - last[2]:stop - last[2]]
+        songs = self._songs(playlist, start, stop)
+        self._last_page = (playlist, len(playlist), start, stop, songs)
+        return songs
+
+    def _command_for(self, song: Song) -> MenuCommand:
+        """
+        Builds the command run when a song is selected.
+        """
+        return PlaySongCommand(csv_path=self.csv_full_path, selected_song=song.title, selected_artist=song.artist)
+
+    @staticmethod
+    def _label(playlist: IndexedPlaylist, song: Song) -> str:
+        if playlist.title_count(song.title) > 1:
+            return f"{song.title} - {song.artist}"
+        return song.title
+
+    def __len__(self) -> int:
+        return len(self._playlist())
+
+    def __getitem__(self, index: slice) -> list[str]:
+        playlist = self._playlist()
+        start, stop, _ = index.indices(len(playlist))
+        return [self._label(playlist, song) for song in self._window(playlist, start, stop)]
+
+    def command_at(self, index: int) -> Optional[MenuCommand]:
+        songs = self._window(self._playlist(), index, index + 1) if index >= 0 else []
+        return self._command_for(songs[0]) if songs else None
+
+    def prefetch_candidates(self, start: int, stop: int) -> List[Tuple[str, str]]:
+        return [(song.title, song.artist) for song in self._window(self._playlist(), start, stop)]
+
+
 # ============================================================
 # SEE SONGS COMMAND 
 # ============================================================
 
-class SeeSongCommand(MenuCommand):
+class SeeSongCommand(ComputerCommand):
     """
     Command to display a list of all songs from a CSV playlist.
     Each song becomes a selectable option for playback.
     """
 
-    def __init__(
-        self,
-        csv_path: str,
-        computer: CustomComputer,
-        main_menu_name: str,
-        main_menu_options: dict[str, MenuCommand]
-    ):
+    def __init__(self, csv_path: str):
         """
-        Initialize with a CSV path and UI context.
+        Initialize with a CSV path.
 
         Preconditions:
             - csv_path must be a valid .csv file path.
-            - computer must be a CustomComputer instance.
-            - main_menu_name must be a string.
-            - main_menu_options must be a dict with string keys and MenuCommand values.
         """
         assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must point to a .csv file"
-        assert isinstance(main_menu_name, str) and main_menu_name.strip(), "main_menu_name must be a non-empty string"
-        assert isinstance(main_menu_options, dict), "main_menu_options must be a dictionary"
         self.csv_path = csv_path
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
 
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+    def execute_on(self, computer: CustomComputer, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
-        Displays all songs as selectable options.
+        Displays all songs as selectable options. Options are listed lazily, one page at a time.
 
         Returns:
             list[Message]: Menu options for each song, plus a 'Back' button.
@@ -61,50 +125,30 @@ class SeeSongCommand(MenuCommand):
         csv_full_path = os.path.join(current_dir, self.csv_path)
         assert os.path.isfile(csv_full_path), f"CSV file does not exist at {csv_full_path}"
 
-        with open(csv_full_path, 'r') as f:
-            reader = csv.reader(f)
-            songs = [row[0] for row in reader if row]  # Only song titles
-
-        song_options: Dict[str, MenuCommand] = {
-            "Back": BackToMainMenuCommand(self.computer, self.main_menu_name, self.main_menu_options)
-        }
-        for song in songs:
-            song_options[song] = PlaySongCommand(selected_song=song)
+        song_options = CombinedOptionSource(BACK_OPTION, SongOptionSource(csv_full_path))
 
-        self.computer.set_menu_options(song_options)
-        return self.computer.player_interacted(player)
+        computer.set_menu_options(song_options, player)
+        return computer.player_interacted(player)
 
 
 # ============================================================
 # NEW PLAYLIST COMMANDS
 # ============================================================
 
-class CreatePlaylistCommand(MenuCommand):
+class CreatePlaylistCommand(ComputerCommand):
     """
     Command to create a new playlist CSV file in the resources/playlists directory.
     """
 
-    def __init__(
-        self,
-        computer: CustomComputer,
-        main_menu_name: str,
-        main_menu_options: dict[str, MenuCommand],
-        new_csv_name: str = "new_playlist.csv"
-    ):
+    def __init__(self, new_csv_name: str = "new_playlist.csv"):
         """
         Parameters:
-            computer (CustomComputer): The interface used for interaction.
-            main_menu_name (str): Title of the main menu.
-            main_menu_options (dict): Menu options to return to after creation.
             new_csv_name (str): Name of the new playlist CSV to create.
         """
         assert isinstance(new_csv_name, str) and new_csv_name.endswith(".csv"), "new_csv_name must end in .csv"
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
         self.new_csv_name = new_csv_name
 
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+    def execute_on(self, computer: CustomComputer, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
         Creates the playlist file and informs the player.
 
@@ -115,82 +159,52 @@ class CreatePlaylistCommand(MenuCommand):
 
         with open(csv_full_path, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(["title", "genre", "popularity", "userrating"])  # CSV Header
+            writer.writerow(["title", "artist", "genre", "popularity", "userrating"])  # CSV Header
 
         messages: List[Message] = [ServerMessage(player, f"Playlist created: {self.new_csv_name}.")]
-        self.computer.set_menu_options(self.main_menu_options)
-        messages.extend(self.computer.player_interacted(player))
+        messages.extend(computer.show_main_menu(player))
         return messages
 
 
-class OpenPlaylistCommand(MenuCommand):
+class OpenPlaylistCommand(ComputerCommand):
     """
     Command to display a submenu where players can create or open playlists.
     """
 
-    def __init__(self, computer: CustomComputer, main_menu_name: str, main_menu_options: dict[str, MenuCommand]):
-        """
-        Initializes the command with UI context and fallback menu options.
-
-        Preconditions:
-            - All arguments must be non-null and valid types.
-        """
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
-
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+    def execute_on(self, computer: CustomComputer, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
         Presents options to create a new playlist or view an existing one.
 
         Returns:
             list[Message]: Menu message with new options.
         """
-        new_menu: Dict[str, MenuCommand] = {
-            "Create Playlist": CreatePlaylistCommand(
-                computer=self.computer,
-                main_menu_name=self.main_menu_name,
-                main_menu_options=self.main_menu_options
-            ),
-            "Open Existing": SeeSongCommand(
-                csv_path=os.path.join(BASE_DIR, "resources", "playlists", "$ome $exy $ongs 4 U.csv"),
-                computer=self.computer,
-                main_menu_name=self.main_menu_name,
-                main_menu_options=self.main_menu_options
-            ),
-            "Back": BackToMainMenuCommand(self.computer, self.main_menu_name, self.main_menu_options)
-        }
-
-        self.computer.set_menu_options(new_menu)
-        return self.computer.player_interacted(player)
+        computer.set_menu_options(PLAYLIST_MENU, player)
+        return computer.player_interacted(player)
 
 
 # ============================================================
 # BACK COMMAND
 # ============================================================
 
-class BackToMainMenuCommand(MenuCommand):
+class BackToMainMenuCommand(ComputerCommand):
     """
-    Command that resets the computer menu to its original state.
+    Command that resets the computer menu to its main menu.
     """
 
-    def __init__(self, computer: CustomComputer, main_menu_name: str, main_menu_options: dict[str, MenuCommand]):
-        """
-        Initializes the command with the menu to revert to.
-
-        Preconditions:
-            - All arguments must be valid types and non-empty.
-        """
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
-
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+    def execute_on(self, computer: CustomComputer, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
         Resets the CustomComputer to its main menu and displays it.
 
         Returns:
             list[Message]: MenuMessage with original options.
         """
-        self.computer.set_menu_options(self.main_menu_options)
-        return [MenuMessage(self.computer, player, self.main_menu_name, list(self.main_menu_options.keys()))]
+        return computer.show_main_menu(player)
+
+
+# Shared, never modified: the same option sources serve every computer in every room
+BACK_OPTION = DictOptionSource({"Back": BackToMainMenuCommand()})
+PLAYLIST_MENU = DictOptionSource({
+    "Create Playlist": CreatePlaylistCommand(),
+    "Open Existing": SeeSongCommand(os.path.join(BASE_DIR, "resources", "playlists", "$ome $exy $ongs 4 U.csv")),
+    "Back": BackToMainMenuCommand()
+})
@@ -1,9 +1,13 @@
 import os
 import csv
 import random
+import weakref
+from abc import ABC, abstractmethod
 from .imports import *
+from .music.outbox import Outbox
+from .music.prefetch import PrefetchScheduler
 
-from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List
+from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List, Union, Tuple
 if TYPE_CHECKING:
     from coord import Coord
     from maps.base import Map
@@ -12,21 +16,223 @@ if TYPE_CHECKING:
     from Player import HumanPlayer
 
 
+# ============================================================
+# MENU OPTION SOURCES
+# ============================================================
+
+class MenuOptionSource(ABC):
+    """
+    A sequence-like list of menu options.
+    Labels are produced one slice at a time and a command is only built once its option is selected,
+    so very long menus never have to be materialized.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        Returns the total number of options.
+        """
+        pass
+
+    @abstractmethod
+    def __getitem__(self, index: slice) -> list[str]:
+        """
+        Returns the labels of the options in the given slice.
+
+        Parameters:
+            index (slice): The positions to list.
+
+        Returns:
+            list[str]: Option labels, in menu order.
+        """
+        pass
+
+    @abstractmethod
+    def command_at(self, index: int) -> Optional[MenuCommand]:
+        """
+        Builds the command for the option at a given position.
+
+        Parameters:
+            index (int): Position of the option.
+
+        Returns:
+            Optional[MenuCommand]: The command to execute, or None if the position is out of range.
+        """
+        pass
+
+    def find(self, label: str) -> Optional[MenuCommand]:
+        """
+        Looks up a command by label, for options that are not on the page currently displayed.
+        Sources that cannot do this cheaply return None.
+        """
+        return None
+
+    def prefetch_candidates(self, start: int, stop: int) -> List[Tuple[str, str]]:
+        """
+        Returns the songs worth downloading ahead of time while options [start, stop) are on screen.
+
+        Returns:
+            List[Tuple[str, str]]: (title, artist) pairs; empty for menus that don't list songs.
+        """
+        return []
+
+
+class DictOptionSource(MenuOptionSource):
+    """
+    Option source backed by a regular dictionary of label to command.
+    The labels are read once, when the source is created; the dictionary must not change afterwards.
+    """
+
+    def __init__(self, options: dict[str, MenuCommand]):
+        """
+        Parameters:
+            options (dict): A dictionary mapping option names to commands.
+
+        Preconditions:
+            - options must be a dictionary of string: MenuCommand
+        """
+        assert isinstance(options, dict), "options must be a dictionary"
+        self.options = options
+        self.__labels: list[str] = list(options.keys())
+
+    def __len__(self) -> int:
+        return len(self.__labels)
+
+    def __getitem__(self, index: slice) -> list[str]:
+        return self.__labels[index]
+
+    def command_at(self, index: int) -> Optional[MenuCommand]:
+        return self.options[self.__labels[index]] if 0 <= index < len(self.__labels) else None
+
+    def find(self, label: str) -> Optional[MenuCommand]:
+        return self.options.get(label)
+
+
+class CombinedOptionSource(MenuOptionSource):
+    """
+    Option source listing the options of several sources one after the other,
+    e.g. a fixed 'Back' button followed by a long list of songs.
+    """
+
+    def __init__(self, *sources: MenuOptionSource):
+        """
+        Parameters:
+            sources (MenuOptionSource): The sources to list, in order.
+        """
+        assert all(isinstance(source, MenuOptionSource) for source in sources), "sources must be MenuOptionSource objects"
+        self.sources = sources
+
+    def __len__(self) -> int:
+        return sum(len(source) for source in self.sources)
+
+    def __getitem__(self, index: slice) -> list[str]:
+        start, stop, _ = index.indices(len(self))
+        labels: list[str] = []
+        offset = 0
+        for source in self.sources:
+            size = len(source)
+            if stop > offset and start < offset + size:
+                labels.extend(source[max(0, start - offset):stop - offset])
+            offset += size
+        return labels
+
+    def command_at(self, index: int) -> Optional[MenuCommand]:
+        for source in self.sources:
+            size = len(source)
+            if index < size:
+                return source.command_at(index)
+            index -= size
+        return None
+
+    def find(self, label: str) -> Optional[MenuCommand]:
+        for source in self.sources:
+            cmd = source.find(label)
+            if cmd is not None:
+                return cmd
+        return None
+
+    def prefetch_candidates(self, start: int, stop: int) -> List[Tuple[str, str]]:
+        candidates: List[Tuple[str, str]] = []
+        offset = 0
+        for source in self.sources:
+            size = len(source)
+            if stop > offset and start < offset + size:
+                candidates.extend(source.prefetch_candidates(max(0, start - offset), min(size, stop - offset)))
+            offset += size
+        return candidates
+
+
+# ============================================================
+# COMPUTER COMMANDS
+# ============================================================
+
+class ComputerCommand(MenuCommand, ABC):
+    """
+    A menu command that acts on the computer it is selected from, e.g. to open a submenu.
+    The computer is passed to each call instead of being stored in the command, so one instance
+    can be shared by every computer and every room (flyweight), as in the houses' shared menus.
+    """
+
+    @abstractmethod
+    def execute_on(self, computer: "CustomComputer", context: "Map", player: "HumanPlayer") -> list[Message]:
+        """
+        Runs the command for a player using a computer.
+
+        Parameters:
+            computer (CustomComputer): The computer the command was selected from.
+            context (Map): The room the player is in.
+            player (HumanPlayer): The player who selected the command.
+
+        Returns:
+            list[Message]: Messages for the player.
+        """
+        pass
+
+    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+        """
+        ComputerCommands need to know their computer, so they are run through CustomComputer.select_option.
+        Run any other way, the player is told to use the command from a computer instead.
+
+        Returns:
+            list[Message]: A message explaining where the command can be used.
+        """
+        return [ServerMessage(player, "This option can only be used from a computer.")]
+
+
 # ============================================================
 # CUSTOM COMPUTER 
 # ============================================================
 
+class MenuSession:
+    """
+    What one player is looking at on a computer: the option source shown (shared, never copied),
+    how far they scrolled, and the labels of the page on their screen.
+    """
+    __slots__ = ("menu_options", "option_source", "scroll_index", "visible_labels")
+
+    def __init__(self, menu_options: Union[dict[str, MenuCommand], MenuOptionSource], option_source: MenuOptionSource):
+        self.menu_options = menu_options
+        self.option_source = option_source
+        self.scroll_index: int = 0
+        self.visible_labels: list[str] = []
+
+
 class CustomComputer(UtilityObject, SelectionInterface):
     """
     A custom computer object that players can interact with to select from a menu of commands.
-    Supports paginated options and scroll navigation.
+    Supports paginated options and scroll navigation. Options may come from a lazy MenuOptionSource,
+    so only the labels currently on screen are listed and commands are built when selected.
+    The options given at construction are the main menu, which submenus return to.
+
+    Each player has their own MenuSession, so several players can browse different submenus
+    of the same computer at once without changing what the others see.
     """
 
     def __init__(
         self,
         image_name: str = 'computer',
         menu_name: str = 'Select an option',
-        menu_options: dict[str, MenuCommand] = {}
+        menu_options: Union[dict[str, MenuCommand], MenuOptionSource] = {}
     ) -> None:
         """
         Initializes the CustomComputer with menu options and scroll settings.
@@ -34,46 +240,94 @@ class CustomComputer(UtilityObject, SelectionInterface):
         Parameters:
             image_name (str): The image to use for the computer object.
             menu_name (str): Title shown in the menu interface.
-            menu_options (dict): A dictionary mapping option names to commands.
+            menu_options (dict | MenuOptionSource): The main menu: option names mapped to commands,
+                or a (possibly shared) source of options.
 
         Preconditions:
             - image_name must be a valid sprite/image asset.
             - menu_name must be a non-empty string.
-            - menu_options must be a dictionary of string: MenuCommand
+            - menu_options must be a dictionary of string: MenuCommand, or a MenuOptionSource
         """
         assert isinstance(menu_name, str) and menu_name.strip(), "menu_name must be a non-empty string"
-        assert isinstance(menu_options, dict), "menu_options must be a dictionary"
+        assert isinstance(menu_options, (dict, MenuOptionSource)), "menu_options must be a dictionary or a MenuOptionSource"
 
         super().__init__(image_name, passable=False)
         self.__menu_name: str = menu_name
-        self.__menu_options: dict[str, MenuCommand] = {}
+        self.__main_menu_options: Union[dict[str, MenuCommand], MenuOptionSource] = {}
+        self.__main_option_source: MenuOptionSource = DictOptionSource({})
+        # Sessions go away with their player
+        self.__sessions: "weakref.WeakKeyDictionary[HumanPlayer, MenuSession]" = weakref.WeakKeyDictionary()
         self.set_menu_options(menu_options)
 
-        self.__scroll_index: int = 0  # Start index for visible options
         self.__page_size: int = 5     # Number of options per page
 
-    def set_menu_options(self, menu_options: dict[str, MenuCommand]):
+    @staticmethod
+    def __as_source(menu_options: Union[dict[str, MenuCommand], MenuOptionSource]) -> MenuOptionSource:
+        if isinstance(menu_options, MenuOptionSource):
+            return menu_options
+        return DictOptionSource(menu_options)
+
+    def __session(self, player: "HumanPlayer") -> MenuSession:
+        session = self.__sessions.get(player)
+        if session is None:
+            session = MenuSession(self.__main_menu_options, self.__main_option_source)
+            self.__sessions[player] = session
+        return session
+
+    def set_menu_options(
+        self,
+        menu_options: Union[dict[str, MenuCommand], MenuOptionSource],
+        player: Optional["HumanPlayer"] = None
+    ):
         """
-        Set or update the computer's menu options and reset the scroll.
+        Set or update the menu options and reset the scroll.
+        With a player, only that player's menu changes (e.g. opening a submenu);
+        without one, the main menu is replaced and every player goes back to it.
 
         Parameters:
-            menu_options (dict): New mapping of option labels to commands.
+            menu_options (dict | MenuOptionSource): New mapping of option labels to commands,
+                or a lazy source of options.
+            player (Optional[HumanPlayer]): The player whose menu changes.
 
         Preconditions:
-            - menu_options must be a dictionary with string keys and MenuCommand values.
+            - menu_options must be a dictionary with string keys and MenuCommand values,
+              or a MenuOptionSource.
+        """
+        assert isinstance(menu_options, (dict, MenuOptionSource)), "menu_options must be a dictionary or a MenuOptionSource"
+        if player is None:
+            self.__main_menu_options = menu_options
+            self.__main_option_source = self.__as_source(menu_options)
+            self.__sessions.clear()
+        else:
+            self.__sessions[player] = MenuSession(menu_options, self.__as_source(menu_options))
+
+    def show_main_menu(self, player: "HumanPlayer") -> list[Message]:
+        """
+        Takes a player back to the main menu and displays it.
+
+        Parameters:
+            player (HumanPlayer): The player using the computer.
+
+        Returns:
+            list[Message]: The main menu message.
         """
-        assert isinstance(menu_options, dict), "menu_options must be a dictionary"
-        self.__menu_options = menu_options
-        self.__scroll_index = 0  # Reset scroll to top when menu is updated
+        self.__sessions.pop(player, None)
+        return self.player_interacted(player)
 
-    def get_menu_options(self) -> dict[str, MenuCommand]:
+    def get_menu_options(self, player: Optional["HumanPlayer"] = None) -> Union[dict[str, MenuCommand], MenuOptionSource]:
         """
-        Get the current menu options.
+        Get the menu options a player is looking at, or the main menu.
+
+        Parameters:
+            player (Optional[HumanPlayer]): The player whose menu to return.
 
         Returns:
-            dict[str, MenuCommand]: The current menu option mappings.
+            dict[str, MenuCommand] | MenuOptionSource: The menu options, as they were set.
         """
-        return self.__menu_options
+        if player is None:
+            return self.__main_menu_options
+        session = self.__sessions.get(player)
+        return session.menu_options if session is not None else self.__main_menu_options
 
     def player_interacted(self, player: "HumanPlayer") -> list[Message]:
         """
@@ -83,7 +337,8 @@ class CustomComputer(UtilityObject, SelectionInterface):
             player (HumanPlayer): The player who interacted.
 
         Returns:
-            list[Message]: Menu message displaying current options.
+            list[Message]: Messages queued for the player (e.g. finished downloads),
+            followed by the menu message displaying current options.
 
         Preconditions:
             - player must be a valid HumanPlayer object.
@@ -91,16 +346,23 @@ class CustomComputer(UtilityObject, SelectionInterface):
         assert player is not None, "player cannot be None"
 
         player.set_current_menu(self)
-        options_list = list(self.__menu_options.keys())
-        visible_options = options_list[self.__scroll_index : self.__scroll_index + self.__page_size]
+        session = self.__session(player)
+        page_start, page_stop = session.scroll_index, session.scroll_index + self.__page_size
+        session.visible_labels = session.option_source[page_start:page_stop]
+
+        # Warm the audio cache with the songs on this page; replaces the prefetches of the previous page.
+        PrefetchScheduler.get_instance().request(player, session.option_source.prefetch_candidates(page_start, page_stop))
+        visible_options = list(session.visible_labels)
 
         # Insert scroll items if needed.
-        if self.__scroll_index > 0:
+        if session.scroll_index > 0:
             visible_options.insert(0, "Scroll Up")
-        if self.__scroll_index + self.__page_size < len(options_list):
+        if session.scroll_index + self.__page_size < len(session.option_source):
             visible_options.append("Scroll Down")
 
-        return [MenuMessage(self, player, self.__menu_name, visible_options)]
+        messages: list[Message] = Outbox.get_instance().drain(player)
+        messages.append(MenuMessage(self, player, self.__menu_name, visible_options))
+        return messages
 
     def select_option(self, player: "HumanPlayer", option: str) -> list[Message]:
         """
@@ -114,27 +376,31 @@ class CustomComputer(UtilityObject, SelectionInterface):
             list[Message]: Result of the command or menu update.
 
         Preconditions:
-            - option must be a string and either match a key in __menu_options or be a scroll control.
+            - option must be a string and either match a displayed option or be a scroll control.
         """
         assert isinstance(option, str), "option must be a string"
         assert player is not None, "player cannot be None"
 
-        options_list = list(self.__menu_options.keys())
-
+        session = self.__session(player)
         if option == "Scroll Down":
-            self.__scroll_index = min(
-                self.__scroll_index + self.__page_size,
-                max(0, len(options_list) - self.__page_size)
+            session.scroll_index = min(
+                session.scroll_index + self.__page_size,
+                max(0, len(session.option_source) - self.__page_size)
             )
             return self.player_interacted(player)
 
         elif option == "Scroll Up":
-            self.__scroll_index = max(0, self.__scroll_index - self.__page_size)
+            session.scroll_index = max(0, session.scroll_index - self.__page_size)
             return self.player_interacted(player)
 
-        if option in self.__menu_options:
-            cmd = self.__menu_options[option]
-            return cmd.execute(player.get_current_room(), player)
+        if option in session.visible_labels:
+            cmd = session.option_source.command_at(session.scroll_index + session.visible_labels.index(option))
+        else:
+            cmd = session.option_source.find(option)
+        if isinstance(cmd, ComputerCommand):
+            return Outbox.get_instance().drain(player) + cmd.execute_on(self, player.get_current_room(), player)
+        if cmd is not None:
+            return Outbox.get_instance().drain(player) + cmd.execute(player.get_current_room(), player)
 
         # Invalid selection, return no action
         return []
@@ -1,4 +1,3 @@
-import inspect
 import os, sys, types
 import importlib.util
 
@@ -14,7 +13,8 @@ def find_303mud(start_dir):
         current = parent
 
 current_directory = os.path.dirname(__file__)
-mud_folder = find_303mud(current_directory)
+# When this file is imported again under another package name, reuse the folder found the first time
+mud_folder = sys.modules['303MUD'].__path__[0] if '303MUD' in sys.modules else find_303mud(current_directory)
 assert mud_folder, "The 303MUD folder could not be found. Did you set up the folder structure as seen in class?"
 
 def load_module(module, root_folder):
@@ -24,6 +24,9 @@ def load_module(module, root_folder):
     
     alias = '303MUD.' + '.'.join(module.split('/'))
     
+    if alias in sys.modules:
+        return sys.modules[alias]
+    
     if '303MUD' not in sys.modules:
         mud_pkg = types.ModuleType('303MUD')
         mud_pkg.__path__ = [root_folder]
@@ -33,13 +36,10 @@ def load_module(module, root_folder):
     if spec is None:
         raise ImportError(f"Could not load spec for {module_name} from {module_path}")
     
-    if alias in sys.modules:
-        module_obj = sys.modules[alias]
-    else:
-        module_obj = importlib.util.module_from_spec(spec)
-        module_obj.__package__ = alias.rpartition('.')[0]
-        spec.loader.exec_module(module_obj)
-        sys.modules[alias] = module_obj
+    module_obj = importlib.util.module_from_spec(spec)
+    module_obj.__package__ = alias.rpartition('.')[0]
+    spec.loader.exec_module(module_obj)
+    sys.modules[alias] = module_obj
     
     return module_obj
 
@@ -50,8 +50,9 @@ for module in modules_to_load:
 
 __all__ = []
 for mod in modules:
-    for name, obj in inspect.getmembers(mod):
-        if inspect.isclass(obj) and obj.__module__ == mod.__name__:
+    # The module's own namespace is enough: inspect.getmembers would also run dir() and sort every name
+    for name, obj in vars(mod).items():
+        if isinstance(obj, type) and obj.__module__ == mod.__name__:
             globals()[name] = obj
             __all__.append(name)
 
@@ -0,0 +1,115 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+class ObserverDispatcher:
+    """
+    Delivers MusicManager updates to observers on a background thread.
+
+    Updates are coalesced while they wait: only the latest update per (type, round, song) is kept,
+    so a burst of votes for one song becomes a single update carrying its final count.
+    After the first update of a burst arrives, the worker waits `window` seconds to collect
+    the rest, then hands every observer the whole batch through Observer.update_batch.
+    An observer that raises is reported and skipped; the others still get the batch.
+    """
+
+    def __init__(
+        self,
+        get_observers: Callable[[], Sequence[Any]],
+        window: float = 0.05,
+        max_pending: int = 1024
+    ):
+        """
+        Parameters:
+            get_observers (Callable): Returns the observers to deliver to at the time of delivery.
+            window (float): Seconds to collect a burst of updates before delivering it.
+            max_pending (int): Maximum number of distinct updates waiting; once reached,
+                submit() blocks until the worker catches up (back-pressure).
+
+        Preconditions:
+            - window must be non-negative and max_pending positive.
+        """
+        assert window >= 0, "window must be non-negative"
+        assert isinstance(max_pending, int) and max_pending > 0, "max_pending must be a positive integer"
+        self._get_observers = get_observers
+        self.window = window
+        self.max_pending = max_pending
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        self._delivering = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="observer-dispatcher", daemon=True)
+        self._worker.start()
+
+    @staticmethod
+    def _coalesce_key(data: Dict[str, Any]) -> Hashable:
+        return (data.get("type"), data.get("round"), data.get("song"))
+
+    def submit(self, data: Dict[str, Any]) -> None:
+        """
+        Queues an update for delivery, replacing any waiting update for the same song.
+
+        Parameters:
+            data (Dict[str, Any]): The update to deliver.
+
+        Preconditions:
+            - The dispatcher must not be shut down.
+        """
+        key = self._coalesce_key(data)
+        with self._condition:
+            assert not self._stopped, "dispatcher is shut down"
+            while key not in self._pending and len(self._pending) >= self.max_pending:
+                self._condition.wait()
+            self._pending[key] = data
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every submitted update has been delivered.
+
+        Parameters:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if everything was delivered, False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._delivering, timeout)
+
+    def shutdown(self) -> None:
+        """
+        Delivers what is still waiting, then stops the worker thread.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._worker.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopped)
+                if not self._pending:
+                    return
+            if self.window and not self._stopped:
+                with self._condition:
+                    # Collect the rest of the burst; shutdown cuts the wait short
+                    self._condition.wait_for(lambda: self._stopped, self.window)
+            with self._condition:
+                batch: List[Dict[str, Any]] = list(self._pending.values())
+                self._pending = {}
+                self._delivering = True
+                self._condition.notify_all()
+            try:
+                self._deliver(batch)
+            finally:
+                with self._condition:
+                    self._delivering = False
+                    self._condition.notify_all()
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        for obs in self._get_observers():
+            try:
+                obs.update_batch(batch)
+            except Exception as e:
+                print(f"Observer {type(obs).__name__} failed to handle an update: {e}")
@@ -0,0 +1,105 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+try:
+    # Optional: keeps updates O(log n) on large leaderboards
+    from sortedcontainers import SortedList
+except ImportError:
+    SortedList = None
+
+
+class _SortedKeys:
+    """
+    The part of sortedcontainers.SortedList the leaderboard uses, over a plain sorted list.
+    Inserting and removing shift the list (O(n), a single memmove), which is fine for a round's worth of songs.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, index):
+        return self._keys[index]
+
+    def add(self, key: Tuple[int, str]) -> None:
+        insort(self._keys, key)
+
+    def remove(self, key: Tuple[int, str]) -> None:
+        del self._keys[bisect_left(self._keys, key)]
+
+    def bisect_left(self, key: Tuple[int, str]) -> int:
+        return bisect_left(self._keys, key)
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+class Leaderboard:
+    """
+    Songs ordered by vote count.
+
+    Entries are stored as (-votes, song) keys in a sorted list, so the leaders are always at the
+    front: top(k) is a slice, winner() is the first entry and rank(song) is a binary search.
+    Ties are broken by song name.
+
+    A leaderboard does no locking of its own; MusicManager updates and reads it with its round lock held.
+    With sortedcontainers installed an update is O(log n).
+    """
+
+    def __init__(self):
+        self._keys = SortedList() if SortedList is not None else _SortedKeys()
+        self._votes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._votes)
+
+    def update(self, song: str, votes: int) -> None:
+        """
+        Records a song's new vote count and moves it to its new place.
+
+        Parameters:
+            song (str): The song.
+            votes (int): Its vote count.
+        """
+        current = self._votes.get(song)
+        if current is not None:
+            self._keys.remove((-current, song))
+        self._votes[song] = votes
+        self._keys.add((-votes, song))
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """
+        Returns the k songs with the most votes.
+
+        Parameters:
+            k (int): Number of songs to return.
+
+        Returns:
+            List[Tuple[str, int]]: (song, votes) pairs, most votes first.
+        """
+        assert isinstance(k, int) and k >= 0, "k must be a non-negative integer"
+        return [(song, -negative_votes) for negative_votes, song in self._keys[:k]]
+
+    def rank(self, song: str) -> Optional[int]:
+        """
+        Returns a song's position on the leaderboard, starting at 1, or None if it has no votes.
+        """
+        votes = self._votes.get(song)
+        if votes is None:
+            return None
+        return self._keys.bisect_left((-votes, song)) + 1
+
+    def winner(self) -> Optional[str]:
+        """
+        Returns the song with the most votes, or None if nobody voted.
+        """
+        return self._keys[0][1] if len(self._keys) else None
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        self._keys.clear()
+        self._votes.clear()
@@ -1,5 +1,10 @@
+import threading
+from collections import deque
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Deque
+
+from .voting_round import VotingRound
+from .dispatcher import ObserverDispatcher
 
 
 class Observer(ABC):
@@ -21,40 +26,77 @@ class Observer(ABC):
         """
         pass
 
+    def update_batch(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        Called with a batch of updates when the MusicManager dispatches asynchronously.
+        Only the latest update per song is included. Calls update() for each one by default;
+        observers that can handle a whole batch at once may override it.
+
+        Parameters:
+            updates (List[Dict[str, Any]]): The updates, each shaped like the data passed to update().
+        """
+        for data in updates:
+            self.update(data)
+
 
 class MusicManager:
     """
     Singleton class that manages voting for songs and notifies registered observers
-    whenever votes are cast or updated.
+    whenever votes are cast or updated. Votes may be cast from several server threads at once;
+    the round lock serializes them and guards every read of the current round.
+
+    Votes are grouped in rounds. Each player gets one vote per round; closing a round records its
+    winner in a ring buffer of recent rounds and notifies observers with a "round_closed" update.
+    Rounds can be closed on a timer with start_rounds().
     """
 
     _instance: Optional["MusicManager"] = None
+    _instance_lock = threading.Lock()
 
-    def __init__(self):
+    def __init__(self, history_size: int = 10):
         """
         Initializes the MusicManager singleton.
         Raises an exception if an instance already exists.
+
+        Parameters:
+            history_size (int): Number of closed rounds to remember.
         """
         if MusicManager._instance is not None:
             raise Exception("MusicManager is a singleton!")
+        assert isinstance(history_size, int) and history_size > 0, "history_size must be a positive integer"
 
-        self.vote_counts: Dict[str, int] = {}
+        self.current_round = VotingRound(1)
+        self.round_history: Deque[VotingRound] = deque(maxlen=history_size)
+        self._round_lock = threading.Lock()
+        self._round_timer: Optional[threading.Timer] = None
+        self._round_duration: Optional[float] = None
         self.observers: List[Observer] = []
+        self._observers_lock = threading.Lock()
+        self._dispatcher: Optional[ObserverDispatcher] = None
         MusicManager._instance = self
 
     @staticmethod
     def get_instance() -> "MusicManager":
         """
         Returns the singleton instance of MusicManager.
-        If it doesn't exist, it is created.
+        If it doesn't exist, it is created (only once, even when called from several threads).
 
         Returns:
             MusicManager: The singleton instance.
         """
         if MusicManager._instance is None:
-            MusicManager()
+            with MusicManager._instance_lock:
+                if MusicManager._instance is None:
+                    MusicManager()
         return MusicManager._instance  # type: ignore
 
+    @property
+    def vote_counts(self) -> Dict[str, int]:
+        """
+        A snapshot of the current round's vote counts.
+        """
+        return self.get_vote_counts()
+
     def add_observer(self, observer: Observer) -> None:
         """
         Registers an observer to receive updates.
@@ -66,7 +108,8 @@ class MusicManager:
             - observer must not be None.
         """
         assert observer is not None, "Observer cannot be None"
-        self.observers.append(observer)
+        with self._observers_lock:
+            self.observers = self.observers + [observer]
 
     def remove_observer(self, observer: Observer) -> None:
         """
@@ -79,11 +122,49 @@ class MusicManager:
             - observer must be in the current list of observers.
         """
         assert observer in self.observers, "Observer must be registered before removing"
-        self.observers.remove(observer)
+        with self._observers_lock:
+            self.observers = [obs for obs in self.observers if obs is not observer]
+
+    def enable_async_dispatch(self, window: float = 0.05, max_pending: int = 1024) -> None:
+        """
+        Switches to asynchronous notification: cast_vote only queues the update, and a background
+        thread delivers coalesced batches to the observers (see ObserverDispatcher).
+        Does nothing if asynchronous notification is already enabled.
+
+        Parameters:
+            window (float): Seconds to collect a burst of updates before delivering it.
+            max_pending (int): Maximum number of distinct updates waiting before cast_vote blocks.
+        """
+        with self._observers_lock:
+            if self._dispatcher is None:
+                self._dispatcher = ObserverDispatcher(lambda: self.observers, window, max_pending)
+
+    def disable_async_dispatch(self) -> None:
+        """
+        Delivers any queued updates and goes back to notifying observers synchronously.
+        """
+        with self._observers_lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is not None:
+            dispatcher.shutdown()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until queued updates have been delivered. Returns immediately in synchronous mode.
+
+        Parameters:
+            timeout (Optional[float]): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if nothing is left to deliver.
+        """
+        dispatcher = self._dispatcher
+        return dispatcher.flush(timeout) if dispatcher is not None else True
 
     def notify_all(self, data: Dict[str, Any]) -> None:
         """
-        Notifies all observers with the provided update data.
+        Notifies all observers with the provided update data, either right away
+        or through the asynchronous dispatcher if it is enabled.
 
         Parameters:
             data (Dict[str, Any]): A dictionary representing the update.
@@ -92,33 +173,141 @@ class MusicManager:
             - data must be a non-empty dictionary.
         """
         assert isinstance(data, dict) and data, "data must be a non-empty dictionary"
+        dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.submit(data)
+            return
+        # The list is replaced, never mutated, on add/remove, so this iterates over a stable snapshot
         for obs in self.observers:
             obs.update(data)
 
-    def cast_vote(self, song: str) -> None:
+    def cast_vote(self, song: str, player: Optional[object] = None) -> bool:
         """
-        Casts a vote for the given song and notifies observers.
+        Casts a vote for the given song in the current round and notifies observers.
 
         Parameters:
             song (str): The name of the song being voted for.
+            player (Optional[object]): The player voting. When given, the player can only vote once per round.
+
+        Returns:
+            bool: False if the player already voted this round, True once the vote is counted.
 
         Preconditions:
             - song must be a non-empty string.
         """
         assert isinstance(song, str) and song.strip(), "song must be a non-empty string"
 
-        self.vote_counts[song] = self.vote_counts.get(song, 0) + 1
+        # Counting a vote is a dict update and an O(log n) leaderboard move, so one lock for every vote is cheap,
+        # and it stops close_round from closing the round between the voter check and the vote
+        with self._round_lock:
+            voting_round = self.current_round
+            if player is not None and not voting_round.add_voter(player):
+                return False
+            votes = voting_round.vote(song)
         self.notify_all({
             "type": "vote",
             "song": song,
-            "votes": self.vote_counts[song]
+            "votes": votes
+        })
+        return True
+
+    def close_round(self) -> VotingRound:
+        """
+        Closes the current round, starts the next one, and notifies observers with a
+        "round_closed" update carrying the round number, winner, its votes and the round's voters.
+
+        Returns:
+            VotingRound: The round that was closed.
+        """
+        with self._round_lock:
+            closed = self.current_round
+            self.current_round = VotingRound(closed.number + 1)
+            closed.close()
+            self.round_history.append(closed)
+
+        self.notify_all({
+            "type": "round_closed",
+            "round": closed.number,
+            "song": closed.winner,
+            "votes": closed.votes.get(closed.winner, 0) if closed.winner is not None else 0,
+            "voters": list(closed.voters)
         })
+        return closed
+
+    def start_rounds(self, duration: float) -> None:
+        """
+        Closes a round every `duration` seconds on a background timer, replacing any previous schedule.
+
+        Parameters:
+            duration (float): Length of a round in seconds.
+
+        Preconditions:
+            - duration must be positive.
+        """
+        assert duration > 0, "duration must be positive"
+        self.stop_rounds()
+        with self._round_lock:
+            self._round_duration = duration
+            self._schedule_round()
+
+    def stop_rounds(self) -> None:
+        """
+        Stops closing rounds automatically. The current round stays open.
+        """
+        with self._round_lock:
+            self._round_duration = None
+            if self._round_timer is not None:
+                self._round_timer.cancel()
+                self._round_timer = None
+
+    def _schedule_round(self) -> None:
+        # Called with _round_lock held
+        self._round_timer = threading.Timer(self._round_duration, self._on_round_timer)
+        self._round_timer.daemon = True
+        self._round_timer.start()
+
+    def _on_round_timer(self) -> None:
+        try:
+            self.close_round()
+        except Exception as e:
+            print(f"Failed to close voting round: {e}")
+        with self._round_lock:
+            if self._round_duration is not None:
+                self._schedule_round()
 
     def get_vote_counts(self) -> Dict[str, int]:
         """
-        Returns a copy of the current vote counts.
+        Returns a copy of the current round's vote counts.
 
         Returns:
             Dict[str, int]: A mapping from song names to vote totals.
         """
-        return dict(self.vote_counts)
+        with self._round_lock:
+            return self.current_round.get_vote_counts()
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """
+        Returns the k songs with the most votes this round, without copying or sorting all counts.
+
+        Parameters:
+            k (int): Number of songs to return.
+
+        Returns:
+            List[Tuple[str, int]]: (song, votes) pairs, most votes first.
+        """
+        with self._round_lock:
+            return self.current_round.leaderboard.top(k)
+
+    def rank(self, song: str) -> Optional[int]:
+        """
+        Returns a song's position in this round's vote, starting at 1, or None if it has no votes.
+        """
+        with self._round_lock:
+            return self.current_round.leaderboard.rank(song)
+
+    def winner(self) -> Optional[str]:
+        """
+        Returns the song leading this round (ties broken by name), or None if nobody voted yet.
+        """
+        with self._round_lock:
+            return self.current_round.leaderboard.winner()
@@ -1,9 +1,9 @@
 import os
-import csv
-import random
 
 from .music_manager import MusicManager
-from ..custom_computer import CustomComputer
+from ..custom_computer import CustomComputer, ComputerCommand, CombinedOptionSource
+from ..commands.playlist_commands import SongOptionSource, BACK_OPTION
+from ..music.song import Song
 from ..imports import *
 
 from typing import TYPE_CHECKING, Optional, Any, Dict, cast, List
@@ -15,10 +15,48 @@ if TYPE_CHECKING:
     from Player import HumanPlayer
 
 
-class VoteForSongCommand(MenuCommand):
+class CastVoteCommand(MenuCommand):
     """
-    Command that prompts the player to vote for a song from a list loaded from a CSV.
-    The chosen song receives a vote, which is tracked via the MusicManager singleton.
+    Command that casts the player's vote for one song, tracked via the MusicManager singleton.
+    """
+
+    def __init__(self, song_title: str):
+        """
+        Parameters:
+            song_title (str): Title of the song to vote for.
+
+        Preconditions:
+            - song_title must be a non-empty string.
+        """
+        assert isinstance(song_title, str) and song_title.strip(), "song_title must be a non-empty string"
+        self.song_title = song_title
+
+    def execute(self, context, player) -> List[Message]:
+        """
+        Casts the vote and confirms it.
+
+        Returns:
+            List[Message]: A ServerMessage indicating the result.
+        """
+        assert player is not None, "player must not be None"
+        if not MusicManager.get_instance().cast_vote(self.song_title, player):
+            return [ServerMessage(player, "You already voted this round. Wait for the next one!")]
+        return [ServerMessage(player, f"You voted for '{self.song_title}'")]
+
+
+class VoteOptionSource(SongOptionSource):
+    """
+    Lists the songs of a playlist as menu options; selecting one votes for it.
+    """
+
+    def _command_for(self, song: Song) -> MenuCommand:
+        return CastVoteCommand(song.title)
+
+
+class VoteForSongCommand(ComputerCommand):
+    """
+    Command that shows the songs of a playlist on the computer so the player can vote for one.
+    Songs are listed one page at a time from the cached catalog; selecting a song casts the vote.
     """
 
     def __init__(self, csv_path: str):
@@ -26,7 +64,7 @@ class VoteForSongCommand(MenuCommand):
         Initialize the command with the path to the CSV file.
 
         Parameters:
-            csv_path (str): Relative path to the playlist CSV file.
+            csv_path (str): Path to the playlist CSV file, relative to the project root.
 
         Preconditions:
             - csv_path must be a valid, readable .csv file path.
@@ -34,17 +72,17 @@ class VoteForSongCommand(MenuCommand):
         assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a valid .csv file"
         self.csv_path = csv_path
 
-    def execute(self, context, player) -> List[Message]:
+    def execute_on(self, computer: CustomComputer, context, player) -> List[Message]:
         """
-        Execute the voting prompt: display a numbered list of songs,
-        accept player input, cast the vote, and return a confirmation message.
+        Displays the songs as selectable voting options, plus a 'Back' button.
 
         Parameters:
+            computer (CustomComputer): The computer the vote menu is shown on.
             context (Map): The current map context (not used in this method).
-            player (HumanPlayer): The player casting the vote.
+            player (HumanPlayer): The player voting.
 
         Returns:
-            List[Message]: A list containing a ServerMessage indicating the result.
+            List[Message]: The menu of songs to vote for.
 
         Preconditions:
             - The CSV file must exist and be formatted with song titles in the first column.
@@ -56,25 +94,9 @@ class VoteForSongCommand(MenuCommand):
         csv_full_path = os.path.join(project_root, self.csv_path)
         assert os.path.isfile(csv_full_path), f"CSV file does not exist at {csv_full_path}"
 
-        with open(csv_full_path, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)  # Skip header row if present
-            songs = [row[0].strip() for row in reader if row]
-
-        if not songs:
+        vote_options = VoteOptionSource(csv_full_path)
+        if len(vote_options) == 0:
             return [ServerMessage(player, "No songs available to vote for.")]
 
-        print("\nVote for a song:")
-        for i, song in enumerate(songs):
-            print(f"{i+1}. {song}")
-
-        choice = input("Enter the number of the song you want to vote for: ")
-
-        try:
-            selected_index = int(choice) - 1
-            selected_song = songs[selected_index]
-        except (ValueError, IndexError):
-            return [ServerMessage(player, "Invalid choice. Try again.")]
-
-        MusicManager.get_instance().cast_vote(selected_song)
-        return [ServerMessage(player, f"You voted for '{selected_song}'")]
+        computer.set_menu_options(CombinedOptionSource(BACK_OPTION, vote_options), player)
+        return computer.player_interacted(player)
@@ -1,7 +1,100 @@
-from .music_manager import Observer
-from typing import Any, Dict
+from .music_manager import MusicManager, Observer
+from ..music.catalog import PlaylistCatalog
+from ..music.prefetch import PrefetchScheduler
+from ..music.outbox import Outbox
+from ..commands.music_commands import request_song_playback
+from ..imports import *
+from typing import Any, Dict, List, Tuple
 
 class VoteDisplayObserver(Observer):
     def update(self, data: Dict[str, Any]) -> None:
         if data["type"] == "vote":
             print(f"VOTE UPDATE: '{data['song']}' now has {data['votes']} votes!")
+        elif data["type"] == "round_closed":
+            if data["song"] is None:
+                print(f"ROUND {data['round']} CLOSED: nobody voted.")
+            else:
+                print(f"ROUND {data['round']} CLOSED: '{data['song']}' wins with {data['votes']} votes!")
+
+    def update_batch(self, updates: List[Dict[str, Any]]) -> None:
+        votes = [data for data in updates if data["type"] == "vote"]
+        if votes:
+            print("VOTE UPDATE: " + ", ".join(f"'{data['song']}' now has {data['votes']} votes" for data in votes) + "!")
+        for data in updates:
+            if data["type"] == "round_closed":
+                self.update(data)
+
+
+class VoteLeaderPrefetchObserver(Observer):
+    """
+    Observer that keeps the songs leading the vote downloaded ahead of time,
+    so the winner can start playing without waiting for its download.
+    """
+
+    def __init__(self, csv_full_path: str, top_n: int = 3):
+        """
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist the votes refer to.
+            top_n (int): Number of leading songs to keep prefetched.
+
+        Preconditions:
+            - csv_full_path must be a .csv file path.
+            - top_n must be positive.
+        """
+        assert isinstance(csv_full_path, str) and csv_full_path.endswith(".csv"), "csv_full_path must be a .csv file"
+        assert isinstance(top_n, int) and top_n > 0, "top_n must be a positive integer"
+        self.csv_full_path = csv_full_path
+        self.top_n = top_n
+
+    def update(self, data: Dict[str, Any]) -> None:
+        if data["type"] != "vote":
+            return
+        leaders = [song for song, _ in MusicManager.get_instance().top(self.top_n)]
+
+        playlist = PlaylistCatalog.get_instance().get_playlist(self.csv_full_path)
+        songs: List[Tuple[str, str]] = []
+        for title in leaders:
+            song = playlist.find(title)
+            if song is not None:
+                songs.append((song.title, song.artist))
+        PrefetchScheduler.get_instance().request("vote leaders", songs)
+
+    def update_batch(self, updates: List[Dict[str, Any]]) -> None:
+        # The leaders only depend on the current counts, so one refresh covers the whole batch
+        for data in updates:
+            if data["type"] == "vote":
+                self.update(data)
+                return
+
+
+class RoundWinnerPlaybackObserver(Observer):
+    """
+    Observer that plays the winning song of each closed voting round for the players who voted in it.
+    Rounds close on a timer thread, so the playback messages (or 'fetching' notices) are queued in
+    each voter's Outbox and shown on their next interaction.
+    """
+
+    def __init__(self, csv_full_path: str):
+        """
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist the votes refer to.
+
+        Preconditions:
+            - csv_full_path must be a .csv file path.
+        """
+        assert isinstance(csv_full_path, str) and csv_full_path.endswith(".csv"), "csv_full_path must be a .csv file"
+        self.csv_full_path = csv_full_path
+
+    def update(self, data: Dict[str, Any]) -> None:
+        if data["type"] != "round_closed" or data["song"] is None:
+            return
+        song = PlaylistCatalog.get_instance().get_playlist(self.csv_full_path).find(data["song"])
+        if song is None:
+            return
+
+        outbox = Outbox.get_instance()
+        for player in data["voters"]:
+            outbox.post(player, ServerMessage(player, f"'{song.title}' won round {data['round']} with {data['votes']} votes!"))
+            player.set_state("last_song", f"{song.title} - {song.artist}")
+            for message in request_song_playback(player, song.title, song.artist):
+                outbox.post(player, message)
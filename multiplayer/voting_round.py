@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Tuple
+
+from .leaderboard import Leaderboard
+
+
+class VotingRound:
+    """
+    The votes of one time-boxed voting round: the vote counts, their leaderboard, and the players who
+    already voted (a set, so the one-vote-per-player check is O(1)).
+
+    A round does no locking of its own: MusicManager only changes or reads the current round with its
+    round lock held, and a closed round is never changed again.
+    """
+
+    def __init__(self, number: int):
+        """
+        Parameters:
+            number (int): The round number, starting at 1.
+        """
+        assert isinstance(number, int) and number > 0, "number must be a positive integer"
+        self.number = number
+        self.votes: Dict[str, int] = {}
+        self.leaderboard = Leaderboard()
+        self.voters: set = set()
+        self.winner: Optional[str] = None
+        self.closed = False
+
+    def add_voter(self, player: object) -> bool:
+        """
+        Registers a player as having voted this round.
+
+        Parameters:
+            player (object): The voting player.
+
+        Returns:
+            bool: False if the player already voted this round.
+        """
+        if player in self.voters:
+            return False
+        self.voters.add(player)
+        return True
+
+    def vote(self, song: str) -> int:
+        """
+        Adds one vote for a song and returns its new count.
+        """
+        votes = self.votes.get(song, 0) + 1
+        self.votes[song] = votes
+        self.leaderboard.update(song, votes)
+        return votes
+
+    def close(self) -> Optional[str]:
+        """
+        Ends the round and records its winner.
+
+        Returns:
+            Optional[str]: The song with the most votes, or None if nobody voted.
+        """
+        self.closed = True
+        self.winner = self.leaderboard.winner()
+        return self.winner
+
+    def results(self) -> List[Tuple[str, int]]:
+        """
+        Returns every song voted for this round, most votes first.
+        """
+        return self.leaderboard.top(len(self.leaderboard))
+
+    def get_vote_counts(self) -> Dict[str, int]:
+        """
+        Returns a copy of the round's vote counts.
+        """
+        return dict(self.votes)
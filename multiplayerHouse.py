@@ -5,6 +5,21 @@ from .multiplayer.vote_observer import *
 from .multiplayer.vote_command import *
 
 
+# Length of a voting round; the winner is played for its voters when the round closes
+VOTING_ROUND_SECONDS = 120
+
+
+@lru_cache(maxsize=None)
+def vote_menu() -> DictOptionSource:
+    """
+    Returns the voting computer's main menu, built once and shared by every multiplayer room.
+
+    Returns:
+        DictOptionSource: The shared menu. It must not be modified.
+    """
+    return DictOptionSource({"Vote for Song": VoteForSongCommand(csv_path=PLAYLIST_CSV_PATH)})
+
+
 class MyHouse_Multiplayer(Map):
     """
     A multiplayer room map where players can vote on which song to play next.
@@ -42,26 +57,23 @@ class MyHouse_Multiplayer(Map):
         # Door to return to Paul's main house
         objects.append((Door('int_entrance', linked_room="Paul House"), Coord(9, 5)))
 
-        # Initialize interactive computer
+        # Register observers once, however many times the room is built
+        manager = MusicManager.get_instance()
+        if not any(isinstance(obs, VoteLeaderPrefetchObserver) for obs in manager.observers):
+            playlist_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "playlists", "$ome $exy $ongs 4 U.csv")
+            manager.add_observer(VoteLeaderPrefetchObserver(playlist_path))
+            manager.add_observer(RoundWinnerPlaybackObserver(playlist_path))
+            # Prefetch bookkeeping is kept off the vote path
+            manager.enable_async_dispatch()
+            manager.start_rounds(VOTING_ROUND_SECONDS)
+
+        # Initialize interactive computer with the shared voting menu
         computer = CustomComputer(
             image_name="computer",
-            menu_name="Select an option",
-            menu_options={}
+            menu_name=MAIN_MENU_NAME,
+            menu_options=vote_menu()
         )
 
-        # Register Observer once (assumed handled internally)
-        manager = MusicManager.get_instance()
-
-        # Menu with voting command
-        main_menu_options: dict[str, MenuCommand] = {
-            "Vote for Song": VoteForSongCommand(
-                csv_path=os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv")
-            )
-        }
-
-        # Assign the menu options to the computer
-        computer.set_menu_options(main_menu_options)
-
         # Add computer to the map at a fixed coordinate
         objects.append((computer, Coord(10, 7)))
 
@@ -0,0 +1,315 @@
+import os
+import json
+import time
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, Optional
+
+from .downloader import fetch_atomically
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOUND_DIR = os.path.join(BASE_DIR, "resources", "sound")
+INDEX_FILENAME = ".audio_index.json"
+
+# Storage formats a song can be cached in, and the file extension each one produces.
+CODEC_EXTENSIONS = {"ogg": ".ogg", "opus": ".opus", "mp3": ".mp3", "wav": ".wav"}
+AUDIO_EXTENSIONS = tuple(CODEC_EXTENSIONS.values())
+DEFAULT_CODEC = "ogg"
+FALLBACK_CODEC = "wav"
+
+
+class AudioCache:
+    """
+    Keeps the downloaded songs in resources/sound under a byte budget.
+
+    The cache records the size, format and last access time of every audio file in an on-disk
+    index and, when the budget is exceeded, deletes the least recently used files first.
+    Files that are currently playing for some player are never evicted.
+    New songs are stored in a compressed format (`codec`), falling back to WAV if that fails.
+    """
+
+    _instance: Optional["AudioCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        sound_dir: str = SOUND_DIR,
+        max_bytes: int = 2 * 1024 ** 3,
+        clock: Callable[[], float] = time.time,
+        save_interval: float = 30.0,
+        codec: str = DEFAULT_CODEC
+    ):
+        """
+        Parameters:
+            sound_dir (str): Directory the audio files are stored in.
+            max_bytes (int): Byte budget for all cached files together.
+            clock (Callable[[], float]): Source of the current time, in seconds.
+            save_interval (float): Minimum number of seconds between index writes caused by reads alone.
+            codec (str): Format new songs are stored in; one of CODEC_EXTENSIONS.
+
+        Preconditions:
+            - max_bytes must be positive.
+            - codec must be a key of CODEC_EXTENSIONS.
+        """
+        assert isinstance(max_bytes, int) and max_bytes > 0, "max_bytes must be a positive integer"
+        assert codec in CODEC_EXTENSIONS, f"codec must be one of {sorted(CODEC_EXTENSIONS)}"
+        self.sound_dir = sound_dir
+        self.max_bytes = max_bytes
+        self.codec = codec
+        self.clock = clock
+        self.save_interval = save_interval
+
+        self._entries: Dict[str, Dict[str, Any]] = {}  # filename -> {"size", "codec", "last_access"}
+        # Files players are listening to; a player's entry goes away with the player
+        self._playing: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+        self._total_bytes = 0
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.RLock()
+        self._load()
+
+    @staticmethod
+    def get_instance() -> "AudioCache":
+        """
+        Returns the shared AudioCache for resources/sound.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            AudioCache: The shared instance.
+        """
+        if AudioCache._instance is None:
+            with AudioCache._instance_lock:
+                if AudioCache._instance is None:
+                    AudioCache._instance = AudioCache()
+        return AudioCache._instance
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.sound_dir, INDEX_FILENAME)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _load(self) -> None:
+        """
+        Reads the index and reconciles it with the files actually present in the directory.
+        """
+        os.makedirs(self.sound_dir, exist_ok=True)
+        stored: Dict[str, Dict[str, Any]] = {}
+        if os.path.isfile(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    stored = json.load(f)
+            except (ValueError, OSError):
+                stored = {}
+
+        for filename in os.listdir(self.sound_dir):
+            path = os.path.join(self.sound_dir, filename)
+            if not filename.lower().endswith(AUDIO_EXTENSIONS) or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            last_access = stored.get(filename, {}).get("last_access", stat.st_mtime)
+            self._entries[filename] = {"size": stat.st_size, "codec": self._codec_of(filename), "last_access": last_access}
+            self._total_bytes += stat.st_size
+        self._dirty = True
+
+    def _save(self, force: bool = False) -> None:
+        """
+        Writes the index atomically if it changed, at most once per save_interval unless forced.
+        """
+        now = self.clock()
+        if not self._dirty or (not force and now - self._last_save < self.save_interval):
+            return
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+        self._last_save = now
+
+    @staticmethod
+    def _codec_of(filename: str) -> str:
+        """
+        Returns the storage format of a cached file, based on its extension.
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        for codec, codec_extension in CODEC_EXTENSIONS.items():
+            if codec_extension == extension:
+                return codec
+        return FALLBACK_CODEC
+
+    def filename_for(self, basename: str, codec: str) -> str:
+        """
+        Returns the file name a song is stored under in a given format.
+
+        Parameters:
+            basename (str): The song's file name without extension, e.g. "Title - Artist".
+            codec (str): One of CODEC_EXTENSIONS.
+        """
+        return basename + CODEC_EXTENSIONS[codec]
+
+    def find(self, basename: str) -> Optional[str]:
+        """
+        Returns the name of the cached file for a song in whichever format it was stored,
+        counting the call as an access. The configured codec is checked first.
+
+        Parameters:
+            basename (str): The song's file name without extension, e.g. "Title - Artist".
+
+        Returns:
+            Optional[str]: The cached file name, or None if the song is not cached.
+        """
+        codecs = [self.codec] + [codec for codec in CODEC_EXTENSIONS if codec != self.codec]
+        for codec in codecs:
+            filename = self.filename_for(basename, codec)
+            if filename in self._entries and self.lookup(filename):
+                return filename
+        return None
+
+    def contains(self, basename: str) -> bool:
+        """
+        Returns whether a song is cached in any format, without counting the call as an access,
+        so probing songs (e.g. for prefetching) doesn't change which files are evicted first.
+
+        Parameters:
+            basename (str): The song's file name without extension, e.g. "Title - Artist".
+        """
+        with self._lock:
+            return any(self.filename_for(basename, codec) in self._entries for codec in CODEC_EXTENSIONS)
+
+    def fetch(self, basename: str, download: Callable[[str, str], None]) -> str:
+        """
+        Downloads a song into the cache, in the configured format or, if that fails, as WAV.
+        Concurrent calls for the same file download it only once (see fetch_atomically).
+
+        Parameters:
+            basename (str): The song's file name without extension, e.g. "Title - Artist".
+            download (Callable[[str, str], None]): Called as download(tmp_dir, codec); must write
+                basename plus the codec's extension into tmp_dir.
+
+        Returns:
+            str: The name of the cached file.
+
+        Raises:
+            Exception: The error of the last attempt if every format failed.
+        """
+        codecs = [self.codec] if self.codec == FALLBACK_CODEC else [self.codec, FALLBACK_CODEC]
+        last_error: Optional[Exception] = None
+        for codec in codecs:
+            filename = self.filename_for(basename, codec)
+            try:
+                fetch_atomically(self.path_for(filename), lambda tmp_dir: download(tmp_dir, codec))
+            except Exception as e:
+                print(f"Could not store '{basename}' as {codec}: {e}")
+                last_error = e
+                continue
+            self.add(filename)
+            return filename
+        assert last_error is not None
+        raise last_error
+
+    def path_for(self, filename: str) -> str:
+        """
+        Returns the full path a cached file is (or will be) stored at.
+        """
+        return os.path.join(self.sound_dir, filename)
+
+    def lookup(self, filename: str) -> bool:
+        """
+        Returns whether a file is cached, counting the call as an access if it is.
+
+        Parameters:
+            filename (str): Name of the audio file.
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is None:
+                return False
+            if not os.path.exists(self.path_for(filename)):
+                # Removed behind our back
+                self._total_bytes -= int(entry["size"])
+                del self._entries[filename]
+                self._dirty = True
+                return False
+            entry["last_access"] = self.clock()
+            self._dirty = True
+            self._save()
+            return True
+
+    def add(self, filename: str) -> None:
+        """
+        Records a newly downloaded file and evicts older files if the budget is exceeded.
+
+        Parameters:
+            filename (str): Name of the audio file, which must already exist in sound_dir.
+
+        Preconditions:
+            - The file must exist in sound_dir.
+        """
+        path = self.path_for(filename)
+        assert os.path.isfile(path), f"{path} does not exist"
+        with self._lock:
+            previous = self._entries.get(filename)
+            if previous is not None:
+                self._total_bytes -= int(previous["size"])
+            size = os.path.getsize(path)
+            self._entries[filename] = {"size": size, "codec": self._codec_of(filename), "last_access": self.clock()}
+            self._total_bytes += size
+            self._dirty = True
+            self.evict(keep=filename)
+            self._save(force=True)
+
+    def mark_playing(self, player: Any, filename: str) -> None:
+        """
+        Protects the file a player is now listening to and releases the one they listened to before.
+
+        Parameters:
+            player (HumanPlayer): The listening player.
+            filename (str): Name of the audio file being played.
+        """
+        with self._lock:
+            self._playing[player] = filename
+
+    def stop_playing(self, player: Any) -> None:
+        """
+        Releases the file a player was listening to, once their playback has stopped.
+
+        Parameters:
+            player (HumanPlayer): The player whose playback stopped.
+        """
+        with self._lock:
+            self._playing.pop(player, None)
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Deletes least recently used files that nobody is listening to until the cache fits its byte budget.
+
+        Parameters:
+            keep (Optional[str]): A file that must not be evicted, e.g. the one just added.
+
+        Returns:
+            List[str]: The names of the deleted files.
+        """
+        removed: List[str] = []
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return removed
+            playing = set(self._playing.values())
+            candidates = sorted(
+                (entry["last_access"], filename) for filename, entry in self._entries.items()
+                if filename != keep and filename not in playing
+            )
+            for _, filename in candidates:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(self.path_for(filename))
+                except FileNotFoundError:
+                    pass
+                self._total_bytes -= int(self._entries.pop(filename)["size"])
+                removed.append(filename)
+            if removed:
+                self._dirty = True
+                self._save(force=True)
+        return removed
@@ -0,0 +1,101 @@
+import importlib
+import threading
+from abc import ABC, abstractmethod
+from types import ModuleType
+from typing import Dict, Optional
+
+# Heavy optional packages are imported the first time they are needed rather than when the
+# maps load, so sessions that never search, download or control playback don't pay for them.
+_modules: Dict[str, ModuleType] = {}
+_modules_lock = threading.Lock()
+
+
+def optional_import(name: str, purpose: str) -> ModuleType:
+    """
+    Imports an optional package on first use and returns it.
+
+    Parameters:
+        name (str): The module to import, e.g. "yt_dlp".
+        purpose (str): What the package is needed for, used in the error message.
+
+    Returns:
+        ModuleType: The imported module.
+
+    Raises:
+        ImportError: If the package is not installed.
+    """
+    module = _modules.get(name)
+    if module is not None:
+        return module
+    with _modules_lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except ImportError as e:
+                raise ImportError(f"{name.split('.')[0]} must be installed to {purpose}") from e
+        return _modules[name]
+
+
+# ============================================================
+# PLAYBACK BACKENDS
+# ============================================================
+
+class PlaybackBackend(ABC):
+    """
+    Controls the song currently playing.
+    """
+
+    @abstractmethod
+    def pause(self) -> None:
+        pass
+
+    @abstractmethod
+    def unpause(self) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
+
+class PygamePlaybackBackend(PlaybackBackend):
+    """
+    Playback control through pygame's mixer, imported when first used.
+    """
+
+    def _music(self):
+        return optional_import("pygame", "control playback").mixer.music
+
+    def pause(self) -> None:
+        self._music().pause()
+
+    def unpause(self) -> None:
+        self._music().unpause()
+
+    def stop(self) -> None:
+        self._music().stop()
+
+
+_playback_backend: Optional[PlaybackBackend] = None
+
+
+def get_playback_backend() -> PlaybackBackend:
+    """
+    Returns the playback backend in use, pygame's unless another one was set.
+    """
+    global _playback_backend
+    if _playback_backend is None:
+        _playback_backend = PygamePlaybackBackend()
+    return _playback_backend
+
+
+def set_playback_backend(backend: PlaybackBackend) -> None:
+    """
+    Replaces the playback backend.
+
+    Parameters:
+        backend (PlaybackBackend): The backend to use from now on.
+    """
+    global _playback_backend
+    assert isinstance(backend, PlaybackBackend), "backend must be a PlaybackBackend"
+    _playback_backend = backend
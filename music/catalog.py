@@ -0,0 +1,363 @@
+import os
+import csv
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, IO
+
+from .song import Song
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None  # type: ignore
+
+
+@contextmanager
+def locked_file(f: IO) -> Iterator[IO]:
+    """
+    Holds an exclusive OS-level lock on an open file, so appends from several processes
+    (e.g. two servers sharing the playlists folder) don't interleave.
+    """
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        # msvcrt locks a byte range; the first byte stands for the whole file
+        position = f.tell()
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        f.seek(position)
+        try:
+            yield f
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        yield f
+
+
+# Up to this many new songs are inserted one by one into a cached sort order; larger batches are merged.
+MERGE_BY_INSERTION_LIMIT = 32
+
+
+class IndexedPlaylist:
+    """
+    The parsed contents of one playlist file together with its lookup indexes and cached sort orders.
+    Songs are only ever appended, so positions in `songs` stay valid for the lifetime of the object.
+    """
+
+    def __init__(self, songs: List[Song]):
+        """
+        Parameters:
+            songs (List[Song]): The songs of the playlist, in file order.
+        """
+        self.songs: List[Song] = []
+        self._by_title: Dict[str, List[int]] = {}
+        self._by_title_artist: Dict[Tuple[str, str], int] = {}
+        # Sort orders keyed by name: (sorted keys, song positions in that order). An order may
+        # cover only the first songs; the ones appended since are merged in when it is next read.
+        self._orders: Dict[str, Tuple[List[Any], List[int]]] = {}
+        self._lock = threading.Lock()
+        for song in songs:
+            self.append(song)
+
+    def __len__(self) -> int:
+        return len(self.songs)
+
+    def append(self, song: Song) -> int:
+        """
+        Adds a song to the end of the playlist and indexes it.
+
+        Parameters:
+            song (Song): The song to add.
+
+        Returns:
+            int: The position of the new song.
+        """
+        assert isinstance(song, Song), "song must be a Song"
+        with self._lock:
+            index = len(self.songs)
+            self.songs.append(song)
+            self._by_title.setdefault(song.title_key, []).append(index)
+            self._by_title_artist.setdefault((song.title_key, song.artist_key), index)
+        return index
+
+    def sort_order(self, name: str, key: Callable[[Song], Any]) -> List[int]:
+        """
+        Returns the positions of the songs sorted in ascending order of `key`.
+        The order is computed on first use and cached under `name`. Songs appended since the last call
+        are merged in as one batch, so adding songs never touches the cached orders.
+        Songs with equal keys keep their playlist order.
+
+        Parameters:
+            name (str): Identifies the sort order, e.g. the strategy class name.
+            key (Callable[[Song], Any]): Function returning the sort key of a song.
+
+        Returns:
+            List[int]: Song positions in sorted order. The list is shared and must not be mutated.
+        """
+        cached = self._orders.get(name)
+        if cached is not None and len(cached[1]) == len(self.songs):
+            return cached[1]
+
+        with self._lock:
+            cached = self._orders.get(name)
+            count = len(self.songs)
+            if cached is None:
+                keys = [key(song) for song in self.songs]
+                indices = sorted(range(count), key=keys.__getitem__)
+                cached = ([keys[i] for i in indices], indices)
+            elif len(cached[1]) < count:
+                cached = self._merge_appended(cached, key, count)
+            self._orders[name] = cached
+        return cached[1]
+
+    def _merge_appended(
+        self,
+        order: Tuple[List[Any], List[int]],
+        key: Callable[[Song], Any],
+        count: int
+    ) -> Tuple[List[Any], List[int]]:
+        """
+        Returns a copy of a sort order with the songs it doesn't cover yet merged in, up to position `count`.
+        New lists are built once per batch, so readers holding the previous order are never affected.
+        Must be called with the lock held.
+        """
+        covered = len(order[1])
+        if count - covered <= MERGE_BY_INSERTION_LIMIT:
+            keys, indices = list(order[0]), list(order[1])
+            for index in range(covered, count):
+                song_key = key(self.songs[index])
+                # bisect_right: after the songs with an equal key, which all come earlier in the playlist
+                position = bisect.bisect_right(keys, song_key)
+                keys.insert(position, song_key)
+                indices.insert(position, index)
+            return keys, indices
+
+        # Sorting the sorted order followed by the new songs is a run merge for Timsort, and being
+        # stable it keeps songs with equal keys in playlist order.
+        keys = order[0] + [key(song) for song in self.songs[covered:count]]
+        indices = order[1] + list(range(covered, count))
+        ranks = sorted(range(len(keys)), key=keys.__getitem__)
+        return [keys[i] for i in ranks], [indices[i] for i in ranks]
+
+    def title_count(self, title: str) -> int:
+        """
+        Returns how many songs have a title, compared case-insensitively.
+        """
+        return len(self._by_title.get(Song.normalize(title), ()))
+
+    def find(self, title: str, artist: Optional[str] = None) -> Optional[Song]:
+        """
+        Looks up a song by title, or by title and artist when several songs share a title.
+
+        Parameters:
+            title (str): The song title, compared case-insensitively.
+            artist (Optional[str]): The artist, used to tell apart songs with the same title.
+
+        Returns:
+            Optional[Song]: The matching song, or None if there is no match.
+        """
+        title_key = Song.normalize(title)
+        if artist is not None:
+            index = self._by_title_artist.get((title_key, Song.normalize(artist)))
+            if index is not None:
+                return self.songs[index]
+        matches = self._by_title.get(title_key)
+        return self.songs[matches[0]] if matches else None
+
+
+class PlaylistCatalog:
+    """
+    Process-wide cache of parsed playlist CSV files.
+    Each file is parsed once and only re-read when its modification time or size changes,
+    so every command and map object reading the same playlist shares one in-memory list of Songs.
+    """
+
+    _instance: Optional["PlaylistCatalog"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """
+        Initializes the PlaylistCatalog singleton.
+        Raises an exception if an instance already exists.
+        """
+        if PlaylistCatalog._instance is not None:
+            raise Exception("PlaylistCatalog is a singleton!")
+
+        self._entries: Dict[str, Tuple[Tuple[int, int], IndexedPlaylist]] = {}
+        self._lock = threading.Lock()
+        PlaylistCatalog._instance = self
+
+    @staticmethod
+    def get_instance() -> "PlaylistCatalog":
+        """
+        Returns the singleton instance of PlaylistCatalog.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            PlaylistCatalog: The singleton instance.
+        """
+        if PlaylistCatalog._instance is None:
+            with PlaylistCatalog._instance_lock:
+                if PlaylistCatalog._instance is None:
+                    PlaylistCatalog()
+        return PlaylistCatalog._instance  # type: ignore
+
+    @staticmethod
+    def _key(csv_full_path: str) -> str:
+        """
+        Returns the normalized path used to identify a playlist file.
+        """
+        return os.path.normcase(os.path.abspath(csv_full_path))
+
+    @staticmethod
+    def _stamp(csv_full_path: str) -> Tuple[int, int]:
+        """
+        Returns the (mtime, size) pair used to detect changes to a playlist file.
+        """
+        stat = os.stat(csv_full_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _parse(csv_full_path: str) -> List[Song]:
+        """
+        Reads a playlist CSV into Songs, dropping empty lines, the header row and malformed rows.
+        """
+        with open(csv_full_path, 'r', newline='') as f:
+            reader = csv.reader(f)
+            rows = [row for row in reader if row]
+        if rows and rows[0][0].strip().lower() == "title":
+            rows = rows[1:]
+
+        songs: List[Song] = []
+        for line_number, row in enumerate(rows, start=2):
+            try:
+                songs.append(Song.from_row(row))
+            except ValueError as e:
+                print(f"Skipping malformed row {line_number} in {csv_full_path}: {e}")
+        return songs
+
+    def get_playlist(self, csv_full_path: str) -> IndexedPlaylist:
+        """
+        Returns the indexed playlist for a CSV file, parsing it only if it changed since the last call.
+
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+
+        Returns:
+            IndexedPlaylist: The shared, indexed playlist.
+
+        Preconditions:
+            - csv_full_path must point to an existing .csv file.
+        """
+        assert isinstance(csv_full_path, str) and csv_full_path.endswith(".csv"), "csv_full_path must be a .csv file"
+        assert os.path.isfile(csv_full_path), f"CSV file does not exist at {csv_full_path}"
+
+        key = self._key(csv_full_path)
+        stamp = self._stamp(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+        playlist = IndexedPlaylist(self._parse(key))
+        with self._lock:
+            self._entries[key] = (stamp, playlist)
+        return playlist
+
+    def get_songs(self, csv_full_path: str) -> List[Song]:
+        """
+        Returns the songs of a playlist, parsing the file only if it changed since the last call.
+
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+
+        Returns:
+            List[Song]: The parsed songs (header excluded). The list is shared and must not be mutated.
+        """
+        return self.get_playlist(csv_full_path).songs
+
+    @staticmethod
+    def _write_rows(csv_full_path: str, songs: List[Song]) -> None:
+        """
+        Appends songs to a playlist file with a single locked, fsynced write.
+        If the file doesn't end with a line break, one is added first so the new rows
+        aren't glued onto the last existing row.
+        """
+        with open(csv_full_path, 'a', newline='') as f:
+            with locked_file(f):
+                with open(csv_full_path, 'rb') as tail:
+                    tail.seek(0, os.SEEK_END)
+                    if tail.tell() > 0:
+                        tail.seek(-1, os.SEEK_END)
+                        if tail.read(1) not in (b'\n', b'\r'):
+                            f.write('\r\n')  # The csv module's line terminator
+                writer = csv.writer(f)
+                writer.writerows(song.to_row() for song in songs)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def add_song(self, csv_full_path: str, song: Song) -> None:
+        """
+        Adds a song to the cached playlist only; the file is written later with commit_songs().
+        Until then the song is visible to every reader of the catalog, as long as the file isn't
+        changed by someone else in the meantime.
+
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+            song (Song): The song to add.
+
+        Preconditions:
+            - csv_full_path must point to an existing .csv file.
+        """
+        assert isinstance(song, Song), "song must be a Song"
+        self.get_playlist(csv_full_path).append(song)
+
+    def commit_songs(self, csv_full_path: str, songs: List[Song]) -> None:
+        """
+        Writes songs previously added with add_song() to the playlist file in one batch.
+        The cached playlist already holds them, so it is kept instead of being re-parsed.
+
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+            songs (List[Song]): The songs to write, in the order they were added.
+
+        Preconditions:
+            - csv_full_path must point to an existing .csv file.
+        """
+        assert os.path.isfile(csv_full_path), f"CSV file does not exist at {csv_full_path}"
+        if not songs:
+            return
+
+        key = self._key(csv_full_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            up_to_date = entry is not None and entry[0] == self._stamp(key)
+
+            self._write_rows(key, songs)
+
+            if entry is not None and up_to_date:
+                self._entries[key] = (self._stamp(key), entry[1])
+
+    def invalidate(self, csv_full_path: Optional[str] = None) -> None:
+        """
+        Drops cached data for one playlist, or for every playlist if no path is given.
+
+        Parameters:
+            csv_full_path (Optional[str]): Path of the playlist to forget.
+        """
+        with self._lock:
+            if csv_full_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(csv_full_path), None)
@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Any, Callable, Dict
+
+
+class Cooldown:
+    """
+    Debounces repeated triggers: a key may fire at most once every `seconds` seconds.
+    Uses a monotonic clock, so changes to the system time don't reset or extend cooldowns.
+    """
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            seconds (float): Minimum time between two triggers of the same key.
+            clock (Callable[[], float]): Monotonic time source, replaceable in tests.
+
+        Preconditions:
+            - seconds must be non-negative.
+        """
+        assert seconds >= 0, "seconds must be non-negative"
+        self.seconds = seconds
+        self.clock = clock
+        self._last: Dict[Any, float] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self, key: Any = None) -> float:
+        """
+        Returns how many seconds are left before a key may fire again (0 if it may fire now).
+        """
+        with self._lock:
+            last = self._last.get(key)
+            if last is None:
+                return 0.0
+            return max(0.0, last + self.seconds - self.clock())
+
+    def try_acquire(self, key: Any = None) -> bool:
+        """
+        Fires a key if its cooldown is over.
+
+        Parameters:
+            key (Any): What is being debounced, e.g. a player; None for a single shared cooldown.
+
+        Returns:
+            bool: True if the key fired (and its cooldown restarted), False if it is still cooling down.
+        """
+        with self._lock:
+            now = self.clock()
+            last = self._last.get(key)
+            if last is not None and now - last < self.seconds:
+                return False
+            self._last[key] = now
+            if len(self._last) > 1024:
+                # Forget keys whose cooldown is long over so the table doesn't grow with every player ever seen
+                self._last = {k: t for k, t in self._last.items() if now - t < self.seconds}
+            return True
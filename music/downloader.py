@@ -0,0 +1,222 @@
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .backends import optional_import
+
+
+# yt_dlp's names for the storage formats the audio cache uses
+YTDLP_CODECS = {"ogg": "vorbis", "opus": "opus", "mp3": "mp3", "wav": "wav"}
+
+
+def download_audio(song_url: str, sound_dir: str, basename: str, codec: str = "wav") -> None:
+    """
+    Downloads the audio of a video and converts it to `codec`, in a file named `basename` plus
+    the codec's extension (e.g. "Title - Artist.ogg").
+
+    Parameters:
+        song_url (str): URL of the video to download.
+        sound_dir (str): Directory the audio file is written to.
+        basename (str): File name of the audio, without extension.
+        codec (str): Storage format; one of "ogg", "opus", "mp3" or "wav".
+
+    Preconditions:
+        - yt_dlp and FFmpeg must be installed.
+        - codec must be a key of YTDLP_CODECS.
+    """
+    assert codec in YTDLP_CODECS, f"codec must be one of {sorted(YTDLP_CODECS)}"
+    yt_dlp = optional_import("yt_dlp", "download songs")
+    os.makedirs(sound_dir, exist_ok=True)
+    ydl_opts = {
+        'format': 'bestaudio',
+        'outtmpl': os.path.join(sound_dir, basename),
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': YTDLP_CODECS[codec],
+            'preferredquality': '192'
+        }],
+        'ffmpeg_location': r'C:\ffmpeg\bin'
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([song_url])
+
+
+class TrackLocks:
+    """
+    One lock per track, created on demand and dropped again once nobody holds or waits for it.
+    """
+
+    def __init__(self):
+        self._locks: Dict[str, List[Any]] = {}  # key -> [lock, number of holders and waiters]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """
+        Context manager that holds the lock of a track.
+
+        Parameters:
+            key (str): Identifies the track, e.g. the final path of its audio file.
+        """
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+_track_locks = TrackLocks()
+
+
+def fetch_atomically(final_path: str, produce: Callable[[str], None]) -> bool:
+    """
+    Creates a file exactly once, even if several threads ask for it at the same time.
+
+    Only one caller per path runs `produce`; the others wait for it and then find the finished file.
+    `produce` writes the file into a private temporary directory next to `final_path`, and the file is
+    renamed into place only once it is complete, so a half-written file is never visible.
+
+    Parameters:
+        final_path (str): Where the finished file should end up.
+        produce (Callable[[str], None]): Called with a temporary directory; must create a file named
+            os.path.basename(final_path) inside it.
+
+    Returns:
+        bool: True if this call created the file, False if it already existed.
+
+    Preconditions:
+        - `produce` must create the expected file or raise.
+    """
+    with _track_locks.hold(final_path):
+        if os.path.exists(final_path):
+            return False
+
+        target_dir = os.path.dirname(final_path)
+        os.makedirs(target_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".partial-", dir=target_dir)
+        try:
+            produce(tmp_dir)
+            produced = os.path.join(tmp_dir, os.path.basename(final_path))
+            assert os.path.isfile(produced), f"Download did not produce {os.path.basename(final_path)}"
+            os.replace(produced, final_path)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        return True
+
+
+# Speculative downloads that may run at once; PrefetchScheduler keeps the same number of workers
+# so none of them sits blocked waiting for a download slot
+MAX_SPECULATIVE_WORKERS = 1
+
+
+class DownloadManager:
+    """
+    Runs song downloads on a bounded pool of background threads so commands never wait on the network.
+    Requests for a track that is already being fetched share the in-flight job instead of starting another.
+
+    Speculative downloads (prefetches) run on their own smaller pool, so they never hold up a song a player
+    asked for. If a player asks for a track whose prefetch is still queued, the prefetch is cancelled and
+    the track is downloaded on the main pool instead.
+    """
+
+    _instance: Optional["DownloadManager"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, max_speculative_workers: int = MAX_SPECULATIVE_WORKERS):
+        """
+        Parameters:
+            max_workers (int): Number of requested downloads that may run at the same time.
+            max_pending (int): Maximum number of queued or running jobs; further requests are refused.
+            max_speculative_workers (int): Number of speculative downloads that may run at the same time.
+
+        Preconditions:
+            - max_workers and max_pending must be positive, with max_pending >= max_workers.
+            - max_speculative_workers must be positive.
+        """
+        assert max_workers > 0 and max_pending >= max_workers, "max_pending must be >= max_workers > 0"
+        assert max_speculative_workers > 0, "max_speculative_workers must be positive"
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="song-download")
+        self._speculative_executor = ThreadPoolExecutor(
+            max_workers=max_speculative_workers, thread_name_prefix="song-prefetch-download"
+        )
+        self._in_flight: Dict[str, Tuple[Future, bool]] = {}  # key -> (future, speculative)
+        # Reentrant: cancelling a queued prefetch runs its done callback, which takes the lock again
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_instance() -> "DownloadManager":
+        """
+        Returns the shared DownloadManager.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            DownloadManager: The shared instance.
+        """
+        if DownloadManager._instance is None:
+            with DownloadManager._instance_lock:
+                if DownloadManager._instance is None:
+                    DownloadManager._instance = DownloadManager()
+        return DownloadManager._instance
+
+    def fetch(self, key: str, job: Callable[[], Any], speculative: bool = False) -> Optional[Future]:
+        """
+        Schedules a job unless one with the same key is already queued or running.
+
+        Parameters:
+            key (str): Identifies the track, e.g. the path of its audio file.
+            job (Callable[[], Any]): The work to run in the background.
+            speculative (bool): Whether nobody is waiting for the result yet, e.g. a prefetch.
+
+        Returns:
+            Optional[Future]: The future of the (possibly shared) job, or None if the queue is full.
+            The future of a speculative job is cancelled if the track is requested before the job starts.
+        """
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None and not entry[0].done():
+                future, was_speculative = entry
+                # A requested track doesn't wait behind prefetches: take over the prefetch if it hasn't started
+                if speculative or not was_speculative or not future.cancel():
+                    return future
+            if len(self._in_flight) >= self.max_pending:
+                return None
+            executor = self._speculative_executor if speculative else self._executor
+            future = executor.submit(job)
+            self._in_flight[key] = (future, speculative)
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return future
+
+    def _finished(self, key: str, future: Future) -> None:
+        """
+        Forgets a job once it has completed, so the next request for that key starts a new one.
+        """
+        with self._lock:
+            entry = self._in_flight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._in_flight[key]
+
+    def is_fetching(self, key: str) -> bool:
+        """
+        Returns whether a job for the key is queued or running.
+        """
+        with self._lock:
+            entry = self._in_flight.get(key)
+            return entry is not None and not entry[0].done()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops accepting jobs and optionally waits for running ones to finish.
+        """
+        self._speculative_executor.shutdown(wait=wait)
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,81 @@
+import threading
+import weakref
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+
+class Outbox:
+    """
+    Holds messages produced off the request path (e.g. by background downloads) until the
+    player they are for next interacts with the game, at which point they are delivered.
+    Messages are held per player only while that player exists, and only the latest
+    `max_per_player` of them are kept for a player who hasn't come back yet.
+    """
+
+    _instance: Optional["Outbox"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_per_player: int = 32):
+        """
+        Initializes the Outbox singleton.
+        Raises an exception if an instance already exists.
+
+        Parameters:
+            max_per_player (int): Maximum number of messages waiting for one player; older ones are dropped.
+        """
+        if Outbox._instance is not None:
+            raise Exception("Outbox is a singleton!")
+        assert isinstance(max_per_player, int) and max_per_player > 0, "max_per_player must be a positive integer"
+
+        self.max_per_player = max_per_player
+        self._pending: "weakref.WeakKeyDictionary[Any, Deque[Any]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        Outbox._instance = self
+
+    @staticmethod
+    def get_instance() -> "Outbox":
+        """
+        Returns the singleton instance of Outbox.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            Outbox: The singleton instance.
+        """
+        if Outbox._instance is None:
+            with Outbox._instance_lock:
+                if Outbox._instance is None:
+                    Outbox()
+        return Outbox._instance  # type: ignore
+
+    def post(self, player: Any, message: Any) -> None:
+        """
+        Queues a message for a player.
+
+        Parameters:
+            player (HumanPlayer): The player the message is addressed to.
+            message (Message): The message to deliver.
+
+        Preconditions:
+            - player and message must not be None.
+        """
+        assert player is not None and message is not None, "player and message cannot be None"
+        with self._lock:
+            queue = self._pending.get(player)
+            if queue is None:
+                queue = self._pending[player] = deque(maxlen=self.max_per_player)
+            queue.append(message)
+
+    def drain(self, player: Any) -> List[Any]:
+        """
+        Removes and returns every message queued for a player, oldest first.
+
+        Parameters:
+            player (HumanPlayer): The player whose messages to collect.
+
+        Returns:
+            List[Message]: The queued messages (empty if there are none).
+        """
+        if player not in self._pending:
+            return []
+        with self._lock:
+            return list(self._pending.pop(player, ()))
@@ -0,0 +1,96 @@
+import random
+import threading
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .song import Song
+from .tracks import is_song_cached
+from .prefetch import PrefetchScheduler
+
+
+class PickPool:
+    """
+    A small pool of random songs whose audio is already cached, so a random pick can start playing
+    immediately instead of waiting for a search and download.
+
+    Refilling samples the playlist: cached songs go straight into the pool, and uncached ones are
+    handed to the PrefetchScheduler so they are downloaded in the background and can join the pool
+    on a later refill.
+    """
+
+    def __init__(
+        self,
+        size: int = 5,
+        is_cached: Callable[[str, str], bool] = is_song_cached,
+        prefetch: Optional[Callable[[object, Iterable[Tuple[str, str]]], None]] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Parameters:
+            size (int): Number of cached picks to keep ready.
+            is_cached (Callable): Returns whether (title, artist) is already cached.
+            prefetch (Optional[Callable]): Queues background downloads for an owner;
+                defaults to the shared PrefetchScheduler.
+            rng (Optional[random.Random]): Random source used to sample the playlist.
+
+        Preconditions:
+            - size must be positive.
+        """
+        assert isinstance(size, int) and size > 0, "size must be a positive integer"
+        self.size = size
+        self.is_cached = is_cached
+        self.prefetch = prefetch
+        self.rng = rng if rng is not None else random.Random()
+        self._picks: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._picks)
+
+    def take(self) -> Optional[Tuple[str, str]]:
+        """
+        Removes and returns a random cached pick.
+
+        Returns:
+            Optional[Tuple[str, str]]: (title, artist) of a cached song, or None if the pool is empty.
+        """
+        with self._lock:
+            while self._picks:
+                index = self.rng.randrange(len(self._picks))
+                self._picks[index], self._picks[-1] = self._picks[-1], self._picks[index]
+                pick = self._picks.pop()
+                if self.is_cached(*pick):  # It may have been evicted since it was pooled
+                    return pick
+            return None
+
+    def refill(self, songs: Sequence[Song]) -> None:
+        """
+        Tops the pool up from a random sample of a playlist, and queues downloads of uncached songs
+        from the sample to replenish it later.
+
+        Parameters:
+            songs (Sequence[Song]): The playlist to pick from.
+        """
+        with self._lock:
+            self._picks = [pick for pick in self._picks if self.is_cached(*pick)]
+            missing = self.size - len(self._picks)
+            if missing <= 0 or not songs:
+                return
+
+            pooled = set(self._picks)
+            to_download: List[Tuple[str, str]] = []
+            for index in self.rng.sample(range(len(songs)), min(len(songs), 4 * self.size)):
+                pick = (songs[index].title, songs[index].artist)
+                if pick in pooled:
+                    continue
+                if self.is_cached(*pick):
+                    if len(self._picks) < self.size:
+                        self._picks.append(pick)
+                        pooled.add(pick)
+                elif len(to_download) < missing:
+                    to_download.append(pick)
+
+            missing = self.size - len(self._picks)
+
+        if missing > 0 and to_download:
+            prefetch = self.prefetch if self.prefetch is not None else PrefetchScheduler.get_instance().request
+            prefetch(self, to_download[:missing])
@@ -0,0 +1,143 @@
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
+
+from .downloader import MAX_SPECULATIVE_WORKERS
+from .tracks import is_song_cached, prefetch_song
+
+
+class PrefetchScheduler:
+    """
+    Warms the audio cache in the background with songs that are likely to be played next,
+    such as the songs on the menu page a player is looking at or the current vote leaders.
+
+    Each requester ("owner") has at most one batch of pending songs: a new request from the same owner
+    replaces the songs of the previous one that haven't started yet, so scrolling away cancels
+    prefetches that are no longer useful. At most `max_concurrent` prefetches run at once.
+    """
+
+    _instance: Optional["PrefetchScheduler"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_SPECULATIVE_WORKERS,
+        fetch: Callable[[str, str], Optional[Future]] = prefetch_song,
+        is_cached: Callable[[str, str], bool] = is_song_cached,
+        timeout: float = 600.0
+    ):
+        """
+        Parameters:
+            max_concurrent (int): Maximum number of songs prefetched at the same time. Defaults to the
+                DownloadManager's speculative workers: a worker beyond those would only wait for a free slot.
+            fetch (Callable): Starts a background download of (title, artist) and returns its future.
+            is_cached (Callable): Returns whether (title, artist) is already cached.
+            timeout (float): Seconds a worker waits for one download before moving on.
+
+        Preconditions:
+            - max_concurrent must be positive.
+        """
+        assert isinstance(max_concurrent, int) and max_concurrent > 0, "max_concurrent must be a positive integer"
+        self.max_concurrent = max_concurrent
+        self.fetch = fetch
+        self.is_cached = is_cached
+        self.timeout = timeout
+
+        # (owner, title, artist); only the owner's latest batch is ever queued, and an owner
+        # is forgotten as soon as none of its songs are waiting
+        self._queue: Deque[Tuple[Any, str, str]] = deque()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._stopped = False
+
+    @staticmethod
+    def get_instance() -> "PrefetchScheduler":
+        """
+        Returns the shared PrefetchScheduler.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            PrefetchScheduler: The shared instance.
+        """
+        if PrefetchScheduler._instance is None:
+            with PrefetchScheduler._instance_lock:
+                if PrefetchScheduler._instance is None:
+                    PrefetchScheduler._instance = PrefetchScheduler()
+        return PrefetchScheduler._instance
+
+    def request(self, owner: Any, songs: Iterable[Tuple[str, str]]) -> None:
+        """
+        Replaces the pending prefetches of an owner with a new batch of songs.
+
+        Parameters:
+            owner (Any): Who the prefetch is for, e.g. a player or "vote leaders".
+            songs (Iterable[Tuple[str, str]]): (title, artist) pairs, most likely first.
+        """
+        with self._condition:
+            self._queue = deque(item for item in self._queue if item[0] != owner)
+            for title, artist in songs:
+                self._queue.append((owner, title, artist))
+            if self._queue:
+                self._start_workers()
+                self._condition.notify_all()
+
+    def cancel(self, owner: Any) -> None:
+        """
+        Drops every prefetch of an owner that hasn't started yet.
+        """
+        self.request(owner, [])
+
+    def pending(self, owner: Any) -> List[Tuple[str, str]]:
+        """
+        Returns the (title, artist) pairs still waiting to be prefetched for an owner.
+        """
+        with self._condition:
+            return [(title, artist) for item_owner, title, artist in self._queue if item_owner == owner]
+
+    def _start_workers(self) -> None:
+        """
+        Starts the worker threads on first use. Must be called with the condition held.
+        """
+        while len(self._workers) < self.max_concurrent and not self._stopped:
+            worker = threading.Thread(target=self._run, name="song-prefetch", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next(self) -> Optional[Tuple[str, str]]:
+        """
+        Waits for the next song to prefetch, or returns None once stopped.
+        """
+        with self._condition:
+            while not self._queue and not self._stopped:
+                self._condition.wait()
+            if self._stopped:
+                return None
+            _, title, artist = self._queue.popleft()
+            return (title, artist)
+
+    def _run(self) -> None:
+        while True:
+            song = self._next()
+            if song is None:
+                return
+            title, artist = song
+            try:
+                if self.is_cached(title, artist):
+                    continue
+                future = self.fetch(title, artist)
+                if future is not None:
+                    future.result(self.timeout)
+            except CancelledError:
+                pass  # A player asked for the song, so it is being downloaded as a regular request
+            except Exception as e:
+                print(f"Prefetch of '{title}' by {artist} failed: {e}")
+
+    def shutdown(self) -> None:
+        """
+        Stops the workers once their current prefetch finishes and drops everything pending.
+        """
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify_all()
@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+
+from .song import Song
+from .backends import optional_import
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, "resources", "cache", "search_results.jsonl")
+
+
+# ============================================================
+# SEARCH BACKENDS
+# ============================================================
+
+class SearchBackend(ABC):
+    """
+    Strategy used to turn a search query into the URL of a video to download.
+    """
+
+    @abstractmethod
+    def search(self, query: str) -> Optional[str]:
+        """
+        Searches for a query.
+
+        Parameters:
+            query (str): The search text.
+
+        Returns:
+            Optional[str]: URL of the best match, or None if nothing was found.
+        """
+        pass
+
+
+class YoutubeSearchBackend(SearchBackend):
+    """
+    Searches YouTube with youtubesearchpython (imported on the first search) and returns the first result.
+    """
+
+    def search(self, query: str) -> Optional[str]:
+        VideosSearch = optional_import("youtubesearchpython", "search for songs").VideosSearch
+        result = VideosSearch(query, limit=5).result()
+        results = cast(Dict[str, Any], result)['result']
+        return results[0]['link'] if results else None
+
+
+# ============================================================
+# RESOLUTION CACHE
+# ============================================================
+
+class ResolutionCache:
+    """
+    Persistent (title, artist) -> video URL cache so a song is only searched for once.
+    Entries expire after `ttl` seconds and the least recently used entries are evicted once
+    more than `max_entries` are stored. Entries are kept in a JSON-lines file that is appended
+    to on every new result and compacted when it grows too large.
+    """
+
+    _instance: Optional["ResolutionCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        backend: Optional[SearchBackend] = None,
+        ttl: float = 30 * 24 * 60 * 60,
+        max_entries: int = 1000,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Parameters:
+            cache_path (str): Path of the JSON-lines file backing the cache.
+            backend (Optional[SearchBackend]): Search backend used on cache misses. Defaults to YouTube.
+            ttl (float): Number of seconds a cached result stays valid.
+            max_entries (int): Maximum number of results kept.
+            clock (Callable[[], float]): Source of the current time, in seconds.
+
+        Preconditions:
+            - ttl and max_entries must be positive.
+        """
+        assert ttl > 0, "ttl must be positive"
+        assert isinstance(max_entries, int) and max_entries > 0, "max_entries must be a positive integer"
+        self.cache_path = cache_path
+        self.backend: SearchBackend = backend if backend is not None else YoutubeSearchBackend()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._lines_written = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def get_instance() -> "ResolutionCache":
+        """
+        Returns the shared ResolutionCache stored under resources/cache.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            ResolutionCache: The shared instance.
+        """
+        if ResolutionCache._instance is None:
+            with ResolutionCache._instance_lock:
+                if ResolutionCache._instance is None:
+                    ResolutionCache._instance = ResolutionCache()
+        return ResolutionCache._instance
+
+    def set_backend(self, backend: SearchBackend) -> None:
+        """
+        Replaces the search backend, e.g. with a local stub in tests.
+
+        Parameters:
+            backend (SearchBackend): The backend to use on cache misses.
+        """
+        assert isinstance(backend, SearchBackend), "backend must be a SearchBackend"
+        self.backend = backend
+
+    def _load(self) -> None:
+        """
+        Replays the cache file, keeping the newest unexpired result for each song.
+        """
+        if not os.path.isfile(self.cache_path):
+            return
+        now = self.clock()
+        with open(self.cache_path, 'r') as f:
+            for line in f:
+                self._lines_written += 1
+                try:
+                    record = json.loads(line)
+                    key = (record["title"], record["artist"])
+                    url, stored_at = record["url"], float(record["time"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # Ignore partially written or corrupted lines
+                if now - stored_at < self.ttl:
+                    self._entries.pop(key, None)
+                    self._entries[key] = (url, stored_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _append(self, key: Tuple[str, str], url: str, stored_at: float) -> None:
+        """
+        Persists one result, compacting the file when it holds many stale lines.
+        """
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        if self._lines_written >= 2 * self.max_entries:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                for (title, artist), (entry_url, entry_time) in self._entries.items():
+                    f.write(json.dumps({"title": title, "artist": artist, "url": entry_url, "time": entry_time}) + "\n")
+            os.replace(tmp_path, self.cache_path)
+            self._lines_written = len(self._entries)
+        else:
+            with open(self.cache_path, 'a') as f:
+                f.write(json.dumps({"title": key[0], "artist": key[1], "url": url, "time": stored_at}) + "\n")
+            self._lines_written += 1
+
+    def get(self, title: str, artist: str) -> Optional[str]:
+        """
+        Returns the cached URL for a song, or None if it is missing or expired.
+
+        Parameters:
+            title (str): The song title.
+            artist (str): The song artist.
+        """
+        key = (Song.normalize(title), Song.normalize(artist))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.clock() - entry[1] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, title: str, artist: str, url: str) -> None:
+        """
+        Stores the URL found for a song, evicting the least recently used entry if the cache is full.
+
+        Parameters:
+            title (str): The song title.
+            artist (str): The song artist.
+            url (str): The URL to remember.
+        """
+        assert isinstance(url, str) and url, "url must be a non-empty string"
+        key = (Song.normalize(title), Song.normalize(artist))
+        with self._lock:
+            stored_at = self.clock()
+            self._entries.pop(key, None)
+            self._entries[key] = (url, stored_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._append(key, url, stored_at)
+
+    def resolve(self, title: str, artist: str) -> str:
+        """
+        Returns the URL for a song, searching with the backend only on a cache miss.
+
+        Parameters:
+            title (str): The song title.
+            artist (str): The song artist.
+
+        Returns:
+            str: The URL of the video to download.
+
+        Preconditions:
+            - The backend must find at least one result on a cache miss.
+        """
+        url = self.get(title, artist)
+        if url is not None:
+            return url
+
+        query = f"{title} {artist} audio"
+        url = self.backend.search(query)
+        assert url, f"No results found for query: {query}"
+        self.put(title, artist, url)
+        return url
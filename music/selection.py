@@ -0,0 +1,234 @@
+import random
+import threading
+import weakref
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .catalog import IndexedPlaylist
+from .song import Song
+
+# Random source shared by the selectors handed out by SongSelector.get; reseed it with seed().
+_shared_rng = random.Random()
+
+
+def seed(value: int) -> None:
+    """
+    Reseeds the random source shared by all playlist selectors, making picks reproducible
+    in tests and load runs.
+
+    Parameters:
+        value (int): The seed.
+    """
+    _shared_rng.seed(value)
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: after O(n) preparation, draws an index with probability
+    proportional to its weight in O(1).
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        """
+        Parameters:
+            weights (Sequence[float]): Non-negative weight of each index.
+
+        Preconditions:
+            - weights must not be empty and must not contain negative values.
+        """
+        n = len(weights)
+        assert n > 0, "weights must not be empty"
+        assert all(weight >= 0 for weight in weights), "weights must be non-negative"
+        total = float(sum(weights))
+        if total == 0:
+            weights, total = [1.0] * n, float(n)
+
+        self.probability = array('d', [0.0] * n)
+        self.alias = array('l', [0] * n)
+        scaled = [weight * n / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lesser, greater = small.pop(), large.pop()
+            self.probability[lesser] = scaled[lesser]
+            self.alias[lesser] = greater
+            scaled[greater] -= 1.0 - scaled[lesser]
+            (small if scaled[greater] < 1.0 else large).append(greater)
+        for i in small + large:  # Only rounding error is left
+            self.probability[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def sample(self, rng: random.Random) -> int:
+        """
+        Draws one index.
+        """
+        column = rng.randrange(len(self.probability))
+        return column if rng.random() < self.probability[column] else self.alias[column]
+
+
+class ShuffleQueue:
+    """
+    A no-repeat play order over song positions: every song comes up once before any song repeats.
+    The order is a Fisher-Yates shuffle stored as a compact array of indices, consumed from the end.
+    """
+
+    def __init__(self, size: int, rng: Optional[random.Random] = None):
+        """
+        Parameters:
+            size (int): Number of songs in the playlist.
+            rng (Optional[random.Random]): Random source used for shuffling; defaults to the shared, seedable one.
+        """
+        assert size >= 0, "size must be non-negative"
+        self.size = size
+        self.rng = rng if rng is not None else _shared_rng
+        self.order = array('l')
+        self.refill()
+
+    def refill(self) -> None:
+        """
+        Starts a new round with a fresh shuffle of every song.
+        """
+        order = array('l', range(self.size))
+        for i in range(self.size - 1, 0, -1):
+            j = self.rng.randint(0, i)
+            order[i], order[j] = order[j], order[i]
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def grow(self, size: int) -> None:
+        """
+        Adds songs appended to the playlist to the current round at random positions,
+        without reshuffling the songs that are still queued.
+
+        Parameters:
+            size (int): The new number of songs in the playlist.
+
+        Preconditions:
+            - size must not be smaller than the current size.
+        """
+        assert size >= self.size, "a shuffle queue can only grow"
+        for index in range(self.size, size):
+            self.order.insert(self.rng.randint(0, len(self.order)), index)
+        self.size = size
+
+    def next(self) -> int:
+        """
+        Returns the position of the next song, starting a new round when the current one is over.
+
+        Preconditions:
+            - The playlist must not be empty.
+        """
+        assert self.size > 0, "cannot shuffle an empty playlist"
+        if not self.order:
+            self.refill()
+        return self.order.pop()
+
+
+class SongSelector:
+    """
+    Random song picks over a cached playlist: uniform picks, weighted picks by popularity or user
+    rating (O(1) each through an alias table built once per playlist size), and per-owner
+    no-repeat shuffle queues. All randomness comes from one seedable random source.
+    """
+
+    WEIGHT_FIELDS = ("popularity", "rating")
+
+    _selectors: "weakref.WeakKeyDictionary[IndexedPlaylist, SongSelector]" = weakref.WeakKeyDictionary()
+    _selectors_lock = threading.Lock()
+
+    def __init__(self, playlist: IndexedPlaylist, rng: Optional[random.Random] = None):
+        """
+        Parameters:
+            playlist (IndexedPlaylist): The playlist to pick from.
+            rng (Optional[random.Random]): Random source; defaults to the shared, seedable one.
+        """
+        assert isinstance(playlist, IndexedPlaylist), "playlist must be an IndexedPlaylist"
+        # Held weakly: the selectors cache is keyed by the playlist, so a strong reference would keep it alive
+        self._playlist = weakref.ref(playlist)
+        self.rng = rng if rng is not None else _shared_rng
+        self._alias_tables: Dict[str, AliasTable] = {}
+        # Shuffle queues go away with their owner
+        self._queues: "weakref.WeakKeyDictionary[object, ShuffleQueue]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def playlist(self) -> IndexedPlaylist:
+        """
+        The playlist this selector picks from.
+
+        Preconditions:
+            - The playlist must still be in use somewhere.
+        """
+        playlist = self._playlist()
+        assert playlist is not None, "the playlist of this selector no longer exists"
+        return playlist
+
+    @classmethod
+    def get(cls, playlist: IndexedPlaylist) -> "SongSelector":
+        """
+        Returns the shared selector of a cached playlist, creating it on first use.
+        The selector is dropped together with the playlist when the catalog reloads the file.
+        """
+        with cls._selectors_lock:
+            selector = cls._selectors.get(playlist)
+            if selector is None:
+                selector = cls(playlist)
+                cls._selectors[playlist] = selector
+            return selector
+
+    def uniform(self) -> Song:
+        """
+        Returns a song picked uniformly at random.
+
+        Preconditions:
+            - The playlist must not be empty.
+        """
+        songs = self.playlist.songs
+        assert songs, "cannot pick from an empty playlist"
+        return songs[self.rng.randrange(len(songs))]
+
+    def weighted(self, by: str = "popularity") -> Song:
+        """
+        Returns a song picked with probability proportional to its popularity or user rating.
+
+        Parameters:
+            by (str): "popularity" or "rating".
+
+        Preconditions:
+            - The playlist must not be empty.
+        """
+        assert by in self.WEIGHT_FIELDS, f"by must be one of {self.WEIGHT_FIELDS}"
+        songs = self.playlist.songs
+        assert songs, "cannot pick from an empty playlist"
+        with self._lock:
+            table = self._alias_tables.get(by)
+            if table is None or len(table) != len(songs):
+                # Built lazily, and again only after songs were added
+                table = AliasTable([max(0.0, float(getattr(song, by))) for song in songs])
+                self._alias_tables[by] = table
+        return songs[table.sample(self.rng)]
+
+    def shuffled(self, owner: object) -> Song:
+        """
+        Returns the next song of an owner's shuffle queue; no song repeats until all have played.
+
+        Parameters:
+            owner (object): Whose queue to use, e.g. a player. Must support weak references.
+
+        Preconditions:
+            - The playlist must not be empty.
+        """
+        songs = self.playlist.songs
+        assert songs, "cannot shuffle an empty playlist"
+        with self._lock:
+            queue = self._queues.get(owner)
+            if queue is None:
+                queue = ShuffleQueue(len(songs), self.rng)
+                self._queues[owner] = queue
+            elif queue.size < len(songs):
+                queue.grow(len(songs))
+            return songs[queue.next()]
@@ -0,0 +1,77 @@
+from typing import List, Sequence
+
+
+class Song:
+    """
+    A single playlist entry, parsed and validated once when the playlist is loaded.
+    Numeric fields are stored as numbers and the title/artist are kept pre-normalized
+    so lookups and sorts never have to re-parse the CSV text.
+    """
+
+    __slots__ = ("title", "artist", "genre", "popularity", "rating", "title_key", "artist_key")
+
+    def __init__(self, title: str, artist: str, genre: str = "", popularity: int = 0, rating: float = 0.0):
+        """
+        Parameters:
+            title (str): Song title.
+            artist (str): Performing artist.
+            genre (str): Genre label.
+            popularity (int): Non-negative popularity score.
+            rating (float): User rating.
+
+        Preconditions:
+            - title and artist must be non-empty strings.
+            - popularity must be a non-negative integer.
+        """
+        assert isinstance(title, str) and title.strip(), "title must be a non-empty string"
+        assert isinstance(artist, str) and artist.strip(), "artist must be a non-empty string"
+        assert isinstance(popularity, int) and popularity >= 0, "popularity must be a non-negative integer"
+        self.title: str = title.strip()
+        self.artist: str = artist.strip()
+        self.genre: str = genre.strip()
+        self.popularity: int = popularity
+        self.rating: float = float(rating)
+        self.title_key: str = Song.normalize(title)
+        self.artist_key: str = Song.normalize(artist)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Returns the lookup key used for titles and artists.
+        """
+        return text.strip().lower()
+
+    @classmethod
+    def from_row(cls, row: Sequence[str]) -> "Song":
+        """
+        Builds a Song from a CSV row in the order title,artist,genre,popularity,userrating.
+        Trailing columns may be omitted and fall back to their defaults.
+
+        Parameters:
+            row (Sequence[str]): The raw CSV fields.
+
+        Returns:
+            Song: The parsed song.
+
+        Raises:
+            ValueError: If the title or artist is missing, or a numeric field cannot be parsed.
+        """
+        fields = [field.strip() for field in row]
+        if len(fields) < 2 or not fields[0] or not fields[1]:
+            raise ValueError("Each song must contain at least a title and an artist")
+
+        genre = fields[2] if len(fields) > 2 else ""
+        popularity = int(fields[3]) if len(fields) > 3 and fields[3] else 0
+        rating = float(fields[4]) if len(fields) > 4 and fields[4] else 0.0
+        if popularity < 0:
+            raise ValueError("popularity must be a non-negative integer")
+        return cls(fields[0], fields[1], genre, popularity, rating)
+
+    def to_row(self) -> List[str]:
+        """
+        Returns the song as CSV fields, in the same column order as the playlist files.
+        """
+        return [self.title, self.artist, self.genre, str(self.popularity), str(self.rating)]
+
+    def __repr__(self) -> str:
+        return f"Song({self.title!r}, {self.artist!r}, {self.genre!r}, {self.popularity}, {self.rating})"
@@ -0,0 +1,153 @@
+import atexit
+import threading
+from typing import Dict, List, Optional
+
+from .catalog import PlaylistCatalog
+from .song import Song
+
+
+def parse_song_entry(entry: str) -> Song:
+    """
+    Parses a song typed by a player as "title,artist,genre,popularity,userrating".
+
+    Parameters:
+        entry (str): The text entered.
+
+    Returns:
+        Song: The parsed song.
+
+    Raises:
+        ValueError: If the entry doesn't have 5 fields or a number is invalid.
+    """
+    fields = [field.strip() for field in entry.split(',')]
+    if len(fields) != 5:
+        raise ValueError("Invalid input format. Please use: title,artist,genre,popularity,userrating")
+    try:
+        return Song.from_row(fields)
+    except ValueError:
+        raise ValueError("Invalid popularity or userrating value. Popularity must be an integer and userrating a float.")
+
+
+class SongWriteQueue:
+    """
+    Write-behind queue for songs added to playlists.
+
+    A submitted song is added to the cached playlist right away, so menus, sorting and shuffling see it
+    immediately, and its row is written to the CSV later by a background thread. Rows are written in
+    batches, one locked and fsynced append per playlist, every `flush_interval` seconds or as soon as
+    `max_batch` songs are waiting. Whatever the shared queue still holds is written when the process
+    exits; other queues write theirs when closed.
+    """
+
+    _instance: Optional["SongWriteQueue"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, flush_interval: float = 1.0, max_batch: int = 500):
+        """
+        Parameters:
+            flush_interval (float): Maximum number of seconds a song waits before being written.
+            max_batch (int): Number of waiting songs that triggers an early write.
+
+        Preconditions:
+            - flush_interval and max_batch must be positive.
+        """
+        assert flush_interval > 0, "flush_interval must be positive"
+        assert isinstance(max_batch, int) and max_batch > 0, "max_batch must be a positive integer"
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: Dict[str, List[Song]] = {}
+        self._pending_count = 0
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+
+    @staticmethod
+    def get_instance() -> "SongWriteQueue":
+        """
+        Returns the shared SongWriteQueue.
+        If it doesn't exist, it is created (only once, even when called from several threads).
+
+        Returns:
+            SongWriteQueue: The shared instance.
+        """
+        if SongWriteQueue._instance is None:
+            with SongWriteQueue._instance_lock:
+                if SongWriteQueue._instance is None:
+                    SongWriteQueue._instance = SongWriteQueue()
+                    atexit.register(SongWriteQueue._instance.flush)
+        return SongWriteQueue._instance
+
+    def submit(self, csv_full_path: str, song: Song) -> None:
+        """
+        Adds a song to a playlist: immediately in memory, and in the file at the next batch write.
+
+        Parameters:
+            csv_full_path (str): Absolute path to the playlist CSV.
+            song (Song): The song to add.
+
+        Preconditions:
+            - csv_full_path must point to an existing .csv file.
+            - The queue must not be closed.
+        """
+        assert isinstance(song, Song), "song must be a Song"
+        with self._condition:
+            assert not self._closed, "song write queue is closed"
+            PlaylistCatalog.get_instance().add_song(csv_full_path, song)
+            self._pending.setdefault(csv_full_path, []).append(song)
+            self._pending_count += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="song-writer", daemon=True)
+                self._worker.start()
+            if self._pending_count >= self.max_batch:
+                self._condition.notify_all()
+
+    def pending(self) -> int:
+        """
+        Returns the number of songs not written to their file yet.
+        """
+        with self._condition:
+            return self._pending_count
+
+    def flush(self) -> None:
+        """
+        Writes every queued song now, one batch per playlist.
+        A batch that fails to write is reported and kept for the next attempt.
+        """
+        with self._write_lock:
+            with self._condition:
+                batches, self._pending, self._pending_count = self._pending, {}, 0
+
+            for csv_full_path, songs in batches.items():
+                try:
+                    PlaylistCatalog.get_instance().commit_songs(csv_full_path, songs)
+                except (OSError, AssertionError) as e:
+                    print(f"Couldn't write {len(songs)} song(s) to {csv_full_path}: {e}")
+                    with self._condition:
+                        self._pending[csv_full_path] = songs + self._pending.get(csv_full_path, [])
+                        self._pending_count += len(songs)
+
+    def close(self) -> None:
+        """
+        Writes every queued song and stops the background writer.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            worker = self._worker
+        if worker is not None:
+            worker.join()
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending_count >= self.max_batch or self._closed, self.flush_interval
+                )
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
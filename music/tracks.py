@@ -0,0 +1,56 @@
+from concurrent.futures import Future
+from typing import Optional
+
+from .audio_cache import AudioCache
+from .downloader import DownloadManager, download_audio
+from .search_cache import ResolutionCache
+
+
+def song_basename(song_title: str, artist: str) -> str:
+    """
+    Returns the file name (without extension) a song's audio is cached under.
+    """
+    return f"{song_title} - {artist}"
+
+
+def fetch_song(song_title: str, artist: str, speculative: bool = False) -> Optional[Future]:
+    """
+    Starts downloading a song into the AudioCache in the background.
+    The YouTube search is answered from the ResolutionCache when possible, and a download of the
+    same song that is already queued or running is shared instead of started again.
+
+    Parameters:
+        song_title (str): Title of the song.
+        artist (str): Artist of the song.
+        speculative (bool): Whether this is a prefetch rather than a song a player asked for.
+
+    Returns:
+        Optional[Future]: Resolves to the cached file name, or None if the download queue is full.
+    """
+    cache = AudioCache.get_instance()
+    basename = song_basename(song_title, artist)
+
+    def job() -> str:
+        # The file is downloaded once per track and only appears in the cache when complete.
+        def download(tmp_dir: str, codec: str) -> None:
+            song_url = ResolutionCache.get_instance().resolve(song_title, artist)
+            download_audio(song_url, tmp_dir, basename, codec)
+        return cache.fetch(basename, download)
+
+    return DownloadManager.get_instance().fetch(cache.path_for(basename), job, speculative)
+
+
+def prefetch_song(song_title: str, artist: str) -> Optional[Future]:
+    """
+    Starts a speculative download of a song: it runs behind the songs players asked for,
+    and is taken over by fetch_song if a player asks for the song before it starts.
+    """
+    return fetch_song(song_title, artist, speculative=True)
+
+
+def is_song_cached(song_title: str, artist: str) -> bool:
+    """
+    Returns whether a song's audio is already in the AudioCache, in any format.
+    Only a probe: it doesn't count as a use of the file for eviction.
+    """
+    return AudioCache.get_instance().contains(song_basename(song_title, artist))
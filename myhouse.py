@@ -1,21 +1,13 @@
 import os
 import csv
 import random
+from functools import lru_cache
 
 from .commands.music_commands import *
 from .commands.playlist_commands import *
 from .custom_computer import *
-
-try:
-    import yt_dlp
-except:
-    print("yt_dlp not installed. Won't be able to download songs.")
-
-try:
-
-    from youtubesearchpython import VideosSearch
-except:
-    print("youtubesearchpython not installed. Won't be able to download songs.")
+from .music.catalog import IndexedPlaylist, PlaylistCatalog
+from .music.song import Song
 
 from .imports import *
 from abc import ABC, abstractmethod  # For strategy interface
@@ -35,60 +27,101 @@ if TYPE_CHECKING:
 
 class MusicSortingStrategy(ABC):
     @abstractmethod
-    def sort_songs(self, songs: List[List[str]]) -> List[List[str]]:
+    def sort_key(self, song: Song) -> Any:
+        """
+        Return the key that places a song in this strategy's order (ascending).
+
+        Parameters:
+            song (Song): A song parsed from the playlist.
+
+        Returns:
+            Any: A comparable sort key.
+        """
+        pass
+
+    def cache_name(self) -> str:
+        """
+        Return the name under which playlists cache this strategy's sort order.
+        """
+        return type(self).__name__
+
+    def sort_songs(self, songs: List[Song]) -> List[Song]:
         """
         Sort a list of songs and return the sorted list.
 
         Parameters:
-            songs (List[List[str]]): A list of songs, where each song is a list of fields.
+            songs (List[Song]): A list of songs parsed from the playlist.
 
         Returns:
-            List[List[str]]: Sorted list of songs.
+            List[Song]: Sorted list of songs.
 
         Preconditions:
-            - Each song must be a list with at least 5 elements.
+            - Each song must be a Song instance.
         """
-        pass
+        return sorted(songs, key=self.sort_key)
 
+    def sort_window(self, playlist: IndexedPlaylist, start: int, stop: int) -> List[Song]:
+        """
+        Return only the songs at positions [start, stop) of this strategy's order.
+        The order is sorted once per playlist and cached, so every later window is a slice of it.
 
-class SortByGenreStrategy(MusicSortingStrategy):
-    def sort_songs(self, songs: List[List[str]]) -> List[List[str]]:
+        Parameters:
+            playlist (IndexedPlaylist): The playlist to sort.
+            start (int): First position of the window.
+            stop (int): Position just past the end of the window.
+
+        Returns:
+            List[Song]: The songs in the window, in sorted order.
+
+        Preconditions:
+            - 0 <= start <= stop
+        """
+        assert 0 <= start <= stop, "window bounds must satisfy 0 <= start <= stop"
+        order = playlist.sort_order(self.cache_name(), self.sort_key)
+        songs = playlist.songs
+        return [songs[i] for i in order[start:stop]]
+
+    def sort_page(self, playlist: IndexedPlaylist, page: int, page_size: int) -> List[Song]:
         """
-        Sort songs alphabetically by genre (column index 2).
+        Return page `page` (starting at 0) of this strategy's order.
+
+        Parameters:
+            playlist (IndexedPlaylist): The playlist to sort.
+            page (int): The page number.
+            page_size (int): The number of songs per page.
+
+        Returns:
+            List[Song]: The songs on the page, in sorted order.
 
         Preconditions:
-            - Each song must have at least 3 columns.
+            - page >= 0 and page_size > 0
         """
-        for song in songs:
-            assert len(song) > 2, "Each song must have a genre field at index 2"
-        return sorted(songs, key=lambda x: x[2])
+        assert page >= 0 and page_size > 0, "page must be >= 0 and page_size > 0"
+        return self.sort_window(playlist, page * page_size, (page + 1) * page_size)
 
 
-class SortByPopularityStrategy(MusicSortingStrategy):
-    def sort_songs(self, songs: List[List[str]]) -> List[List[str]]:
+class SortByGenreStrategy(MusicSortingStrategy):
+    def sort_key(self, song: Song) -> Any:
+        """
+        Sort songs alphabetically by genre.
         """
-        Sort songs by popularity (column index 3) descending.
+        return song.genre
 
-        Preconditions:
-            - Each song must have a valid integer at index 3.
+
+class SortByPopularityStrategy(MusicSortingStrategy):
+    def sort_key(self, song: Song) -> Any:
         """
-        for song in songs:
-            assert len(song) > 3 and song[3].isdigit(), "Each song must have a valid integer popularity value at index 3"
-        return sorted(songs, key=lambda x: int(x[3]), reverse=True)
+        Sort songs by popularity descending.
+        """
+        return -song.popularity
 
 
 class SortByUserRatingStrategy(MusicSortingStrategy):
-    def sort_songs(self, songs: List[List[str]]) -> List[List[str]]:
+    def sort_key(self, song: Song) -> Any:
         """
-        Sort songs by user rating (column index 4) descending.
-
-        Preconditions:
-            - Each song must have a valid float at index 4.
+        Sort songs by user rating descending.
         """
-        for song in songs:
-            assert len(song) > 4, "Each song must have a user rating field at index 4"
-            float(song[4])  # Will raise ValueError if not valid
-        return sorted(songs, key=lambda x: float(x[4]), reverse=True)
+        return -song.rating
 
 
 class Playlist:
@@ -103,12 +136,9 @@ class Playlist:
         assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a .csv file"
         self.csv_path = csv_path
 
-    def load_songs(self) -> List[List[str]]:
+    def _indexed(self) -> IndexedPlaylist:
         """
-        Load songs from the CSV file, skipping the header row if present.
-
-        Returns:
-            List[List[str]]: A list of songs, each represented as a list of fields.
+        Return the shared, cached playlist for this CSV file.
 
         Preconditions:
             - File must exist at the given path.
@@ -116,14 +146,35 @@ class Playlist:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         csv_full_path = os.path.join(current_dir, self.csv_path)
         assert os.path.isfile(csv_full_path), f"{csv_full_path} does not exist"
-        with open(csv_full_path, 'r') as f:
-            reader = csv.reader(f)
-            songs = [row for row in reader if row]
-        if songs and songs[0][0].lower() == "title":
-            songs = songs[1:]
-        return songs
+        return PlaylistCatalog.get_instance().get_playlist(csv_full_path)
 
-    def sortPlaylist(self, strategy: MusicSortingStrategy) -> List[List[str]]:
+    def load_songs(self) -> List[Song]:
+        """
+        Load songs from the CSV file, skipping the header row if present.
+
+        Returns:
+            List[Song]: A list of songs parsed from the playlist.
+
+        Preconditions:
+            - File must exist at the given path.
+        """
+        return list(self._indexed().songs)
+
+    def sorted_indices(self, strategy: MusicSortingStrategy) -> List[int]:
+        """
+        Return the positions of the songs in the order given by a strategy.
+        The order is computed once per playlist and strategy, then reused until the file changes.
+
+        Parameters:
+            strategy (MusicSortingStrategy): The sorting strategy to apply.
+
+        Returns:
+            List[int]: Song positions in sorted order. The list is shared and must not be mutated.
+        """
+        assert isinstance(strategy, MusicSortingStrategy), "strategy must implement MusicSortingStrategy"
+        return self._indexed().sort_order(strategy.cache_name(), strategy.sort_key)
+
+    def sortPlaylist(self, strategy: MusicSortingStrategy) -> List[Song]:
         """
         Sort songs using the provided strategy.
 
@@ -131,96 +182,146 @@ class Playlist:
             strategy (MusicSortingStrategy): The sorting strategy to apply.
 
         Returns:
-            List[List[str]]: Sorted list of songs.
+            List[Song]: Sorted list of songs.
+        """
+        assert isinstance(strategy, MusicSortingStrategy), "strategy must implement MusicSortingStrategy"
+        playlist = self._indexed()
+        order = playlist.sort_order(strategy.cache_name(), strategy.sort_key)
+        return [playlist.songs[i] for i in order]
+
+    def sortWindow(self, strategy: MusicSortingStrategy, start: int, stop: int) -> List[Song]:
+        """
+        Return the songs at positions [start, stop) of the order given by a strategy,
+        without materializing the rest of the sorted playlist.
+
+        Parameters:
+            strategy (MusicSortingStrategy): The sorting strategy to apply.
+            start (int): First position of the window.
+            stop (int): Position just past the end of the window.
+
+        Returns:
+            List[Song]: The songs in the window, in sorted order.
         """
         assert isinstance(strategy, MusicSortingStrategy), "strategy must implement MusicSortingStrategy"
-        songs = self.load_songs()
-        return strategy.sort_songs(songs)
+        return strategy.sort_window(self._indexed(), start, stop)
+
+    def __len__(self) -> int:
+        return len(self._indexed())
 
 
 # ============================================================
 # SORTING COMMANDS (Using the Strategy Pattern)
 # ============================================================
 
-class SortByGenreCommand(MenuCommand):
+class SortedSongOptionSource(SongOptionSource):
     """
-    Command to sort a playlist by genre and display the results.
+    Lists the songs of a playlist as menu options, in the order given by a sorting strategy.
+    Only the page being displayed is sorted out, and commands are built on selection.
     """
-    def __init__(self, csv_path: str, computer: CustomComputer, main_menu_name: str, main_menu_options: dict[str, MenuCommand]):
+
+    def __init__(self, playlist: Playlist, strategy: MusicSortingStrategy):
+        """
+        Parameters:
+            playlist (Playlist): The playlist to list.
+            strategy (MusicSortingStrategy): The order to list it in.
+        """
+        assert isinstance(strategy, MusicSortingStrategy), "strategy must implement MusicSortingStrategy"
+        super().__init__(os.path.join(os.path.dirname(os.path.abspath(__file__)), playlist.csv_path))
+        self.playlist = playlist
+        self.strategy = strategy
+
+    def _songs(self, playlist: IndexedPlaylist, start: int, stop: int) -> List[Song]:
+        return self.strategy.sort_window(playlist, start, stop)
+
+
+class SortPlaylistCommand(ComputerCommand):
+    """
+    Base command that shows a playlist sorted by a strategy.
+    Only the songs on the page the player is looking at are sorted out, and commands are built on selection.
+    """
+    def __init__(self, csv_path: str):
+        assert isinstance(csv_path, str) and csv_path.endswith(".csv"), "csv_path must be a .csv file"
         self.csv_path = csv_path
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
 
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
+    @property
+    @abstractmethod
+    def strategy(self) -> MusicSortingStrategy:
         """
-        Executes the sort by genre command and returns interaction messages.
+        Returns the strategy used to order the playlist.
         """
-        playlist = Playlist(self.csv_path)
-        sorted_songs = playlist.sortPlaylist(SortByGenreStrategy())
-        return self._display_sorted_songs(sorted_songs, player)
+        pass
 
-    def _display_sorted_songs(self, songs: List[List[str]], player: "HumanPlayer") -> list[Message]:
+    def execute_on(self, computer: CustomComputer, context: "Map", player: "HumanPlayer") -> list[Message]:
         """
-        Internal helper to show the sorted songs to the player.
+        Executes the sort command and returns interaction messages.
         """
-        song_options: Dict[str, MenuCommand] = {"Back": BackToMainMenuCommand(self.computer, self.main_menu_name, self.main_menu_options)}
-        for row in songs:
-            song_options[row[0]] = PlaySongCommand(selected_song=row[0])
-        self.computer.set_menu_options(song_options)
-        return self.computer.player_interacted(player)
+        return self._display_sorted_songs(computer, Playlist(self.csv_path), self.strategy, player)
 
+    def _display_sorted_songs(self, computer: CustomComputer, playlist: Playlist, strategy: MusicSortingStrategy, player: "HumanPlayer") -> list[Message]:
+        """
+        Internal helper to show the sorted songs to the player, one page at a time.
+        """
+        song_options = CombinedOptionSource(BACK_OPTION, SortedSongOptionSource(playlist, strategy))
+        computer.set_menu_options(song_options, player)
+        return computer.player_interacted(player)
 
-class SortByPopularityCommand(MenuCommand):
+
+class SortByGenreCommand(SortPlaylistCommand):
     """
-    Command to sort a playlist by popularity.
+    Command to sort a playlist by genre and display the results.
     """
-    def __init__(self, csv_path: str, computer: CustomComputer, main_menu_name: str, main_menu_options: dict[str, MenuCommand]):
-        self.csv_path = csv_path
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
+    @property
+    def strategy(self) -> MusicSortingStrategy:
+        return SortByGenreStrategy()
 
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
-        playlist = Playlist(self.csv_path)
-        sorted_songs = playlist.sortPlaylist(SortByPopularityStrategy())
-        return self._display_sorted_songs(sorted_songs, player)
 
-    def _display_sorted_songs(self, songs: List[List[str]], player: "HumanPlayer") -> list[Message]:
-        song_options: Dict[str, MenuCommand] = {"Back": BackToMainMenuCommand(self.computer, self.main_menu_name, self.main_menu_options)}
-        for row in songs:
-            song_options[row[0]] = PlaySongCommand(selected_song=row[0])
-        self.computer.set_menu_options(song_options)
-        return self.computer.player_interacted(player)
+class SortByPopularityCommand(SortPlaylistCommand):
+    """
+    Command to sort a playlist by popularity.
+    """
+    @property
+    def strategy(self) -> MusicSortingStrategy:
+        return SortByPopularityStrategy()
 
 
-class SortByUserRatingCommand(MenuCommand):
+class SortByUserRatingCommand(SortPlaylistCommand):
     """
     Command to sort a playlist by user rating.
     """
-    def __init__(self, csv_path: str, computer: CustomComputer, main_menu_name: str, main_menu_options: dict[str, MenuCommand]):
-        self.csv_path = csv_path
-        self.computer = computer
-        self.main_menu_name = main_menu_name
-        self.main_menu_options = main_menu_options
-
-    def execute(self, context: "Map", player: "HumanPlayer") -> list[Message]:
-        playlist = Playlist(self.csv_path)
-        sorted_songs = playlist.sortPlaylist(SortByUserRatingStrategy())
-        return self._display_sorted_songs(sorted_songs, player)
-
-    def _display_sorted_songs(self, songs: List[List[str]], player: "HumanPlayer") -> list[Message]:
-        song_options: Dict[str, MenuCommand] = {"Back": BackToMainMenuCommand(self.computer, self.main_menu_name, self.main_menu_options)}
-        for row in songs:
-            song_options[row[0]] = PlaySongCommand(selected_song=row[0])
-        self.computer.set_menu_options(song_options)
-        return self.computer.player_interacted(player)
+    @property
+    def strategy(self) -> MusicSortingStrategy:
+        return SortByUserRatingStrategy()
 
 
 # ============================================================
 # MYHOUSE MAP
 # ============================================================
 
+MAIN_MENU_NAME = "Select an option"
+PLAYLIST_CSV_PATH = os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv")
+
+
+@lru_cache(maxsize=None)
+def main_menu() -> DictOptionSource:
+    """
+    Returns the music computer's main menu. It is built once and shared by every PaulHouse:
+    its commands keep no per-room state, so rooms only need a new computer pointing at it.
+
+    Returns:
+        DictOptionSource: The shared main menu. It must not be modified.
+    """
+    return DictOptionSource({
+        "Play Song": PlaySongCommand(),
+        "Last Played Song": LastPlayedSongCommand(),
+        "Pause Song": PauseSongCommand(),
+        "Add Song": AddSongCommand(csv_path=PLAYLIST_CSV_PATH),
+        "Open Playlist": OpenPlaylistCommand(),
+        "Sort by Genre": SortByGenreCommand(csv_path=PLAYLIST_CSV_PATH),
+        "Sort by Popularity": SortByPopularityCommand(csv_path=PLAYLIST_CSV_PATH),
+        "Sort by User Rating": SortByUserRatingCommand(csv_path=PLAYLIST_CSV_PATH),
+    })
+
+
 class PaulHouse(Map):
     """
     A custom map representing Paul's music lounge with a computer for music commands.
@@ -262,39 +363,8 @@ class PaulHouse(Map):
 
         computer = CustomComputer(
             image_name="computer",
-            menu_name="Select an option",
-            menu_options={}
-        )
-        main_menu_options: Dict[str, MenuCommand] = {} 
-        main_menu_options["Play Song"] = PlaySongCommand()
-        main_menu_options["Last Played Song"] = LastPlayedSongCommand()
-        main_menu_options["Pause Song"] = PauseSongCommand()
-        main_menu_options["Add Song"] = AddSongCommand(
-            csv_path=os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv")
-        )
-        main_menu_options["Open Playlist"] = OpenPlaylistCommand(
-            computer=computer,
-            main_menu_name="Select an option",
-            main_menu_options=main_menu_options
-        )
-        main_menu_options["Sort by Genre"] = SortByGenreCommand(
-            csv_path=os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv"),
-            computer=computer,
-            main_menu_name="Select an option",
-            main_menu_options=main_menu_options
-        )
-        main_menu_options["Sort by Popularity"] = SortByPopularityCommand(
-            csv_path=os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv"),
-            computer=computer,
-            main_menu_name="Select an option",
-            main_menu_options=main_menu_options
-        )
-        main_menu_options["Sort by User Rating"] = SortByUserRatingCommand(
-            csv_path=os.path.join("resources", "playlists", "$ome $exy $ongs 4 U.csv"),
-            computer=computer,
-            main_menu_name="Select an option",
-            main_menu_options=main_menu_options
+            menu_name=MAIN_MENU_NAME,
+            menu_options=main_menu()
         )
-        computer.set_menu_options(main_menu_options)
         objects.append((computer, Coord(10, 7)))
         return objects
@@ -1,9 +1,23 @@
 from .myhouse import *
+from .music.catalog import PlaylistCatalog
+from .music.outbox import Outbox
+from .music.selection import SongSelector
+from .music.cooldown import Cooldown
+from .music.pick_pool import PickPool
+
+# Minimum seconds between two songs started by the same plate, and by the same player
+PLATE_COOLDOWN_SECONDS = 2.0
+PLAYER_COOLDOWN_SECONDS = 10.0
 
 class MusicPressurePlate(PressurePlate):
     """
     A custom PressurePlate that plays a random song from a CSV when a player steps on it.
-    Downloads the song using YouTube search and yt_dlp if not already cached.
+    Downloads the song in the background using YouTube search and yt_dlp if not already cached.
+
+    The plate is debounced: it starts at most one song every PLATE_COOLDOWN_SECONDS, and a player
+    walking back and forth only gets a new song every PLAYER_COOLDOWN_SECONDS. Songs are picked from
+    a pool of already-cached tracks when possible, so they start right away; the pool is refilled
+    in the background.
     """
 
     def __init__(self, stepping_text: str, csv_path: str = "resources/playlists/$ome $exy $ongs 4 U.csv") -> None:
@@ -26,70 +40,48 @@ class MusicPressurePlate(PressurePlate):
         self.csv_full_path = os.path.join(current_dir, csv_path)
         assert os.path.isfile(self.csv_full_path), f"CSV file does not exist at {self.csv_full_path}"
 
+        self.plate_cooldown = Cooldown(PLATE_COOLDOWN_SECONDS)
+        self.player_cooldown = Cooldown(PLAYER_COOLDOWN_SECONDS)
+        self.pick_pool = PickPool()
+        # Pre-warm the pool so the first players don't wait for a download
+        self.pick_pool.refill(PlaylistCatalog.get_instance().get_songs(self.csv_full_path))
+
     def player_entered(self, player) -> List[Message]:
         """
-        Called when a player steps on the pressure plate. Picks a random song, downloads it if needed,
-        and plays it through the game's audio system.
+        Called when a player steps on the pressure plate. Unless the plate or the player is cooling down,
+        picks a random song (a cached one if possible), downloads it if needed, and plays it through
+        the game's audio system.
 
         Parameters:
             player (HumanPlayer): The player who triggered the pressure plate.
 
         Returns:
-            List[Message]: A list of messages including a sound message for the chosen song.
+            List[Message]: A list of messages including a sound message for the chosen song,
+            or a message saying it is being fetched. Only the stepping text while cooling down.
 
         Preconditions:
             - `player` must be a valid player object.
             - The CSV file at `self.csv_full_path` must be readable and properly formatted.
         """
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-
-        with open(self.csv_full_path, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)  # Skip header row
-            rows = [row for row in reader if row]
-
-        assert len(rows) > 0, "CSV must contain at least one data row"
-        assert all(len(row) >= 2 for row in rows), "Each CSV row must contain at least song title and artist"
-
-        # Choose a random song row and extract song title and artist
-        song_title, artist = random.choice(rows)[0:2]
-
-        # Build the query as "song_title artist audio"
-        query = f"{song_title} {artist} audio"
-
-        # Search for videos using YouTubeSearch
-        videos_search = VideosSearch(query, limit=5)
-        result = videos_search.result()
-        result_dict = cast(Dict[str, Any], result)
-        results = result_dict['result']
-        assert results, f"No results found for query: {query}"
-        chosen_video = results[0]
-
-        song_url = chosen_video['link']
-
-        # Prepare the sound directory
-        sound_dir = os.path.join(current_dir, "resources", "sound")
-        os.makedirs(sound_dir, exist_ok=True)
-
-        # Create a filename that includes both the song title and artist
-        wav_filename = f"{song_title} - {artist}.wav"
-        wav_path = os.path.join(sound_dir, wav_filename)
-
-        if not os.path.exists(wav_path):
-            ydl_opts = {
-                'format': 'bestaudio',
-                'outtmpl': os.path.join(sound_dir, f"{song_title} - {artist}"),
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192'
-                }],
-                'ffmpeg_location': r'C:\ffmpeg\bin'
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([song_url])
-        else:
-            print(f"{wav_filename} already exists. Skipping download.")
-
-        sound_msg = SoundMessage(player, wav_filename)
-        return super().player_entered(player) + [sound_msg]
+        messages = super().player_entered(player) + Outbox.get_instance().drain(player)
+        # Both cooldowns must be over; checked before acquiring so neither is used up for nothing
+        if self.player_cooldown.remaining(player) > 0 or self.plate_cooldown.remaining() > 0:
+            return messages
+        if not self.plate_cooldown.try_acquire():
+            return messages
+        self.player_cooldown.try_acquire(player)
+
+        playlist = PlaylistCatalog.get_instance().get_playlist(self.csv_full_path)
+
+        assert len(playlist) > 0, "CSV must contain at least one valid song"
+
+        # Choose a random song, preferring one that is already cached
+        pick = self.pick_pool.take()
+        if pick is None:
+            song = SongSelector.get(playlist).uniform()
+            pick = (song.title, song.artist)
+        self.pick_pool.refill(playlist.songs)
+
+        # Play it right away if it is saved locally, otherwise fetch it in the background
+        title, artist = pick
+        return messages + request_song_playback(player, title, artist)
@@ -0,0 +1,123 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, tempfile, shutil
+from music.audio_cache import AudioCache
+
+
+class FakePlayer:
+    pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.sound_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.cache = AudioCache(self.sound_dir, max_bytes=25, clock=self.clock)
+
+    def tearDown(self):
+        shutil.rmtree(self.sound_dir)
+
+    def download(self, filename, size=10):
+        with open(os.path.join(self.sound_dir, filename), "wb") as f:
+            f.write(b"x" * size)
+        self.cache.add(filename)
+
+    def test_least_recently_used_file_evicted(self):
+        self.download("a.wav")
+        self.download("b.wav")
+        self.assertTrue(self.cache.lookup("a.wav"))
+        self.download("c.wav")
+
+        self.assertFalse(os.path.exists(os.path.join(self.sound_dir, "b.wav")))
+        self.assertTrue(self.cache.lookup("a.wav"))
+        self.assertFalse(self.cache.lookup("b.wav"))
+        self.assertEqual(self.cache.total_bytes, 20)
+
+    def test_contains_does_not_count_as_access(self):
+        self.download("a.wav")
+        self.download("b.wav")
+        self.assertTrue(self.cache.contains("a"))
+        self.assertFalse(self.cache.contains("missing"))
+        self.download("c.wav")
+
+        # "a" was only probed, so it is still the least recently used file
+        self.assertFalse(os.path.exists(os.path.join(self.sound_dir, "a.wav")))
+        self.assertTrue(self.cache.contains("b"))
+
+    def test_playing_file_is_not_evicted(self):
+        player = FakePlayer()
+        self.download("a.wav")
+        self.cache.mark_playing(player, "a.wav")
+        self.download("b.wav")
+        self.download("c.wav")
+        self.assertTrue(self.cache.lookup("a.wav"))
+        self.assertFalse(self.cache.lookup("b.wav"))
+
+        # Moving on to another song releases the file
+        self.cache.mark_playing(player, "c.wav")
+        self.download("d.wav")
+        self.assertFalse(self.cache.lookup("a.wav"))
+
+    def test_stopped_or_gone_player_releases_file(self):
+        player, other = FakePlayer(), FakePlayer()
+        self.download("a.wav")
+        self.download("b.wav")
+        self.cache.mark_playing(player, "a.wav")
+        self.cache.mark_playing(other, "b.wav")
+
+        self.cache.stop_playing(player)
+        del other
+        self.download("c.wav")
+        self.download("d.wav")
+        self.assertFalse(self.cache.lookup("a.wav"))
+        self.assertFalse(self.cache.lookup("b.wav"))
+
+    def test_index_survives_restart(self):
+        self.download("a.wav")
+        self.download("b.wav")
+        self.cache.lookup("a.wav")
+        self.cache._save(force=True)
+
+        restarted = AudioCache(self.sound_dir, max_bytes=25, clock=self.clock)
+        self.assertEqual(restarted.total_bytes, 20)
+        with open(os.path.join(self.sound_dir, "c.wav"), "wb") as f:
+            f.write(b"x" * 10)
+        restarted.add("c.wav")
+        self.assertFalse(restarted.lookup("b.wav"))
+        self.assertTrue(restarted.lookup("a.wav"))
+
+    def test_fetch_stores_preferred_codec(self):
+        def download(tmp_dir, codec):
+            with open(os.path.join(tmp_dir, "Song - Artist." + codec), "wb") as f:
+                f.write(b"x" * 5)
+
+        self.assertEqual(self.cache.fetch("Song - Artist", download), "Song - Artist.ogg")
+        self.assertEqual(self.cache.find("Song - Artist"), "Song - Artist.ogg")
+
+    def test_fetch_falls_back_to_wav(self):
+        attempts = []
+
+        def download(tmp_dir, codec):
+            attempts.append(codec)
+            if codec != "wav":
+                raise RuntimeError("encoder missing")
+            with open(os.path.join(tmp_dir, "Song - Artist.wav"), "wb") as f:
+                f.write(b"x" * 5)
+
+        self.assertEqual(self.cache.fetch("Song - Artist", download), "Song - Artist.wav")
+        self.assertListEqual(attempts, ["ogg", "wav"])
+        self.assertEqual(self.cache.find("Song - Artist"), "Song - Artist.wav")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest
+from music import backends
+from music.backends import PlaybackBackend, optional_import
+
+
+class RecordingBackend(PlaybackBackend):
+    def __init__(self):
+        self.calls = []
+
+    def pause(self):
+        self.calls.append("pause")
+
+    def unpause(self):
+        self.calls.append("unpause")
+
+    def stop(self):
+        self.calls.append("stop")
+
+
+class TestBackends(unittest.TestCase):
+    def test_optional_import_is_cached(self):
+        self.assertIs(optional_import("json", "test"), optional_import("json", "test"))
+
+    def test_missing_package_names_purpose(self):
+        with self.assertRaisesRegex(ImportError, "not_a_real_package must be installed to play music"):
+            optional_import("not_a_real_package", "play music")
+
+    def test_playback_backend_can_be_replaced(self):
+        previous = backends._playback_backend
+        try:
+            recording = RecordingBackend()
+            backends.set_playback_backend(recording)
+            backends.get_playback_backend().stop()
+            self.assertListEqual(recording.calls, ["stop"])
+        finally:
+            backends._playback_backend = previous
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, gc, weakref
+from unittest import mock
+from COMP303.imports import HumanPlayer
+from COMP303.custom_computer import CustomComputer, ComputerCommand, DictOptionSource
+
+
+class NamedCommand(ComputerCommand):
+    def __init__(self, name):
+        self.name = name
+
+    def execute_on(self, computer, context, player):
+        return [self.name]
+
+
+class OpenSubmenuCommand(ComputerCommand):
+    def __init__(self, labels):
+        self.labels = labels
+
+    def execute_on(self, computer, context, player):
+        computer.set_menu_options(DictOptionSource({label: NamedCommand(label) for label in self.labels}), player)
+        return computer.player_interacted(player)
+
+
+def menu_labels(messages):
+    # MenuMessage is patched to return the options it was given
+    return messages[-1]
+
+
+class TestCustomComputerSessions(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("COMP303.custom_computer.MenuMessage", lambda computer, player, name, options: options)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.numbers = [f"Number {i}" for i in range(12)]
+        self.letters = [f"Letter {c}" for c in "ABCDEFGH"]
+        self.computer = CustomComputer(menu_options=DictOptionSource({
+            "Numbers": OpenSubmenuCommand(self.numbers),
+            "Letters": OpenSubmenuCommand(self.letters),
+        }))
+        self.alice = HumanPlayer("alice")
+        self.bob = HumanPlayer("bob")
+
+    def test_players_browse_submenus_independently(self):
+        self.computer.select_option(self.alice, "Numbers")
+        self.computer.select_option(self.bob, "Letters")
+        alice_page = menu_labels(self.computer.select_option(self.alice, "Scroll Down"))
+
+        self.assertListEqual(alice_page, ["Scroll Up"] + self.numbers[5:10] + ["Scroll Down"])
+        self.assertListEqual(menu_labels(self.computer.player_interacted(self.bob)), self.letters[:5] + ["Scroll Down"])
+        self.assertListEqual(menu_labels(self.computer.player_interacted(self.alice)), alice_page)
+
+        # Each player selects from the page on their own screen
+        self.assertListEqual(self.computer.select_option(self.alice, "Number 6"), ["Number 6"])
+        self.assertListEqual(self.computer.select_option(self.bob, "Letter B"), ["Letter B"])
+
+    def test_show_main_menu_only_resets_that_player(self):
+        self.computer.select_option(self.alice, "Numbers")
+        self.computer.select_option(self.bob, "Letters")
+        self.computer.select_option(self.bob, "Scroll Down")
+
+        self.assertListEqual(menu_labels(self.computer.show_main_menu(self.alice)), ["Numbers", "Letters"])
+        self.assertListEqual(menu_labels(self.computer.player_interacted(self.bob)), ["Scroll Up"] + self.letters[3:8])
+
+    def test_session_released_with_player(self):
+        self.computer.select_option(self.alice, "Numbers")
+        submenu = weakref.ref(self.computer.get_menu_options(self.alice))
+        self.computer.select_option(self.bob, "Letters")
+
+        del self.alice
+        gc.collect()
+        self.assertIsNone(submenu())
+        self.assertListEqual(menu_labels(self.computer.player_interacted(self.bob)), self.letters[:5] + ["Scroll Down"])
+
+
+if __name__ == "__main__":
+    unittest.main()
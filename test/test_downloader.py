@@ -0,0 +1,155 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, threading, tempfile, shutil, time
+from music.downloader import DownloadManager, fetch_atomically
+from music.outbox import Outbox
+
+
+class TestDownloadManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = DownloadManager(max_workers=1, max_pending=2)
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_concurrent_requests_share_one_job(self):
+        release = threading.Event()
+        calls = []
+
+        def job():
+            calls.append(1)
+            release.wait(5)
+            return "done"
+
+        first = self.manager.fetch("song.wav", job)
+        second = self.manager.fetch("song.wav", job)
+        self.assertIs(first, second)
+        self.assertTrue(self.manager.is_fetching("song.wav"))
+
+        release.set()
+        self.assertEqual(first.result(5), "done")
+        self.assertEqual(len(calls), 1)
+
+    def test_queue_is_bounded(self):
+        release = threading.Event()
+        self.manager.fetch("a.wav", lambda: release.wait(5))
+        self.manager.fetch("b.wav", lambda: release.wait(5))
+        self.assertIsNone(self.manager.fetch("c.wav", lambda: None))
+        release.set()
+
+    def test_finished_job_can_be_requested_again(self):
+        self.manager.fetch("song.wav", lambda: 1).result(5)
+        self.assertFalse(self.manager.is_fetching("song.wav"))
+        self.assertEqual(self.manager.fetch("song.wav", lambda: 2).result(5), 2)
+
+    def test_prefetches_do_not_hold_up_requests(self):
+        release = threading.Event()
+        self.manager.fetch("prefetch.wav", lambda: release.wait(5), speculative=True)
+        self.assertEqual(self.manager.fetch("song.wav", lambda: "played").result(5), "played")
+        release.set()
+
+    def test_request_takes_over_queued_prefetch(self):
+        release = threading.Event()
+        self.manager.fetch("busy.wav", lambda: release.wait(5), speculative=True)
+        prefetch = self.manager.fetch("song.wav", lambda: "prefetched", speculative=True)
+
+        requested = self.manager.fetch("song.wav", lambda: "requested")
+        self.assertIsNot(requested, prefetch)
+        self.assertTrue(prefetch.cancelled())
+        self.assertEqual(requested.result(5), "requested")
+        self.assertIs(self.manager.fetch("busy.wav", lambda: None), self.manager.fetch("busy.wav", lambda: None))
+        release.set()
+
+
+class TestFetchAtomically(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.final_path = os.path.join(self.tmp_dir, "Song - Artist.wav")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_concurrent_fetches_produce_once(self):
+        calls = []
+
+        def produce(tmp_dir):
+            calls.append(tmp_dir)
+            # The final file must not be visible while the download is in progress
+            self.assertFalse(os.path.exists(self.final_path))
+            time.sleep(0.05)
+            with open(os.path.join(tmp_dir, "Song - Artist.wav"), "w") as f:
+                f.write("audio")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fetch_atomically(self.final_path, produce)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(results), [False, False, False, False, True])
+        self.assertListEqual(os.listdir(self.tmp_dir), ["Song - Artist.wav"])
+
+    def test_failed_download_leaves_nothing_behind(self):
+        def produce(tmp_dir):
+            with open(os.path.join(tmp_dir, "partial"), "w") as f:
+                f.write("half")
+            raise IOError("network down")
+
+        with self.assertRaises(IOError):
+            fetch_atomically(self.final_path, produce)
+        self.assertListEqual(os.listdir(self.tmp_dir), [])
+
+
+class FakePlayer:
+    pass
+
+
+class TestOutbox(unittest.TestCase):
+    def setUp(self):
+        # Reset singleton for each test
+        Outbox._instance = None
+        self.outbox = Outbox.get_instance()
+
+    def test_concurrent_get_instance_creates_one_outbox(self):
+        Outbox._instance = None
+        instances = []
+        start = threading.Barrier(8)
+
+        def get():
+            start.wait()
+            instances.append(Outbox.get_instance())
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(instances), 8)
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+
+    def test_drain_returns_messages_once(self):
+        player = FakePlayer()
+        self.outbox.post(player, "first")
+        self.outbox.post(player, "second")
+        self.assertListEqual(self.outbox.drain(player), ["first", "second"])
+        self.assertListEqual(self.outbox.drain(player), [])
+
+    def test_only_latest_messages_kept_per_player(self):
+        player = FakePlayer()
+        for i in range(self.outbox.max_per_player + 2):
+            self.outbox.post(player, i)
+        self.assertListEqual(self.outbox.drain(player), list(range(2, self.outbox.max_per_player + 2)))
+
+    def test_messages_dropped_with_player(self):
+        player = FakePlayer()
+        self.outbox.post(player, "never delivered")
+        del player
+        self.assertEqual(len(self.outbox._pending), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
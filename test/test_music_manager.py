@@ -1,8 +1,11 @@
 import os, sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import unittest
+import unittest, threading, time
+from unittest import mock
 from multiplayer.music_manager import MusicManager, Observer
+from multiplayer.leaderboard import Leaderboard
+from multiplayer.voting_round import VotingRound
 
 
 class DummyObserver(Observer):
@@ -12,12 +15,41 @@ class DummyObserver(Observer):
     def update(self, data):
         self.last_data = data
 
+class BatchObserver(Observer):
+    def __init__(self):
+        self.batches = []
+
+    def update(self, data):
+        self.batches.append([data])
+
+    def update_batch(self, updates):
+        self.batches.append(list(updates))
+
+
+class FailingObserver(Observer):
+    def update(self, data):
+        raise RuntimeError("broken observer")
+
+
+class SlowObserver(Observer):
+    def __init__(self, delay):
+        self.delay = delay
+        self.seen = []
+
+    def update(self, data):
+        time.sleep(self.delay)
+        self.seen.append(data)
+
+
 class TestMusicManager(unittest.TestCase):
     def setUp(self):
         # Reset singleton for each test
         MusicManager._instance = None  
         self.manager = MusicManager.get_instance()
 
+    def tearDown(self):
+        self.manager.disable_async_dispatch()
+
     def test_singleton(self):
         other = MusicManager.get_instance()
         self.assertIs(self.manager, other)
@@ -44,6 +76,195 @@ class TestMusicManager(unittest.TestCase):
         # Cleanup
         self.manager.remove_observer(obs)
 
+    def test_concurrent_votes_are_not_lost(self):
+        songs = [f"Song {i}" for i in range(10)]
+        threads_count, votes_per_thread = 8, 5000
+        start = threading.Barrier(threads_count)
+
+        def vote(offset):
+            start.wait()
+            for i in range(votes_per_thread):
+                self.manager.cast_vote(songs[(i + offset) % len(songs)])
+
+        threads = [threading.Thread(target=vote, args=(n,)) for n in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counts = self.manager.get_vote_counts()
+        self.assertEqual(sum(counts.values()), threads_count * votes_per_thread)
+        self.assertSetEqual(set(counts.values()), {threads_count * votes_per_thread // len(songs)})
+        self.assertDictEqual(dict(self.manager.top(len(songs))), counts)
+
+    def test_concurrent_get_instance_creates_one_manager(self):
+        MusicManager._instance = None
+        instances = []
+        start = threading.Barrier(8)
+
+        def get():
+            start.wait()
+            instances.append(MusicManager.get_instance())
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+
+    def test_async_dispatch_coalesces_bursts(self):
+        obs = BatchObserver()
+        self.manager.add_observer(obs)
+        self.manager.enable_async_dispatch(window=0.1)
+        for _ in range(50):
+            self.manager.cast_vote("Song A")
+        self.manager.cast_vote("Song B")
+        self.assertTrue(self.manager.flush(timeout=2))
+
+        delivered = [data for batch in obs.batches for data in batch]
+        self.assertLess(len(delivered), 51)
+        latest = {data["song"]: data["votes"] for data in delivered}
+        self.assertDictEqual(latest, {"Song A": 50, "Song B": 1})
+
+    def test_async_dispatch_does_not_wait_for_slow_observers(self):
+        obs = SlowObserver(0.2)
+        self.manager.add_observer(obs)
+        self.manager.enable_async_dispatch(window=0)
+        started = time.perf_counter()
+        self.manager.cast_vote("Song A")
+        self.assertLess(time.perf_counter() - started, 0.1)
+        self.assertTrue(self.manager.flush(timeout=2))
+        self.assertEqual(obs.seen[-1]["votes"], 1)
+
+    def test_failing_observer_does_not_block_others(self):
+        obs = BatchObserver()
+        self.manager.add_observer(FailingObserver())
+        self.manager.add_observer(obs)
+        self.manager.enable_async_dispatch(window=0)
+        self.manager.cast_vote("Song C")
+        self.assertTrue(self.manager.flush(timeout=2))
+        self.assertEqual(obs.batches[-1][-1]["song"], "Song C")
+
+    def test_back_pressure_keeps_every_song(self):
+        obs = BatchObserver()
+        self.manager.add_observer(obs)
+        self.manager.enable_async_dispatch(window=0, max_pending=2)
+        for i in range(20):
+            self.manager.cast_vote(f"Song {i}")
+        self.assertTrue(self.manager.flush(timeout=2))
+        delivered = {data["song"] for batch in obs.batches for data in batch}
+        self.assertEqual(len(delivered), 20)
+
+    def test_one_vote_per_player_per_round(self):
+        player = object()
+        self.assertTrue(self.manager.cast_vote("Song A", player))
+        self.assertFalse(self.manager.cast_vote("Song B", player))
+        self.assertDictEqual(self.manager.get_vote_counts(), {"Song A": 1})
+        self.manager.close_round()
+        self.assertTrue(self.manager.cast_vote("Song B", player))
+
+    def test_close_round_records_winner_and_resets_votes(self):
+        obs = DummyObserver()
+        self.manager.add_observer(obs)
+        voters = [object(), object(), object()]
+        for player, song in zip(voters, ["Song A", "Song B", "Song B"]):
+            self.manager.cast_vote(song, player)
+
+        closed = self.manager.close_round()
+        self.assertEqual(closed.winner, "Song B")
+        self.assertEqual(obs.last_data["type"], "round_closed")
+        self.assertEqual(obs.last_data["song"], "Song B")
+        self.assertEqual(obs.last_data["votes"], 2)
+        self.assertCountEqual(obs.last_data["voters"], voters)
+        self.assertDictEqual(self.manager.get_vote_counts(), {})
+        self.assertEqual(self.manager.current_round.number, 2)
+        self.assertIs(self.manager.round_history[-1], closed)
+
+    def test_vote_lands_in_the_round_it_was_checked_against(self):
+        entered, proceed = threading.Event(), threading.Event()
+        vote = VotingRound.vote
+
+        def slow_vote(voting_round, song):
+            entered.set()
+            proceed.wait(5)
+            return vote(voting_round, song)
+
+        closed = []
+        with mock.patch.object(VotingRound, "vote", slow_vote):
+            voter = threading.Thread(target=self.manager.cast_vote, args=("Song A", "player1"))
+            voter.start()
+            self.assertTrue(entered.wait(5))
+            closer = threading.Thread(target=lambda: closed.append(self.manager.close_round()))
+            closer.start()
+            time.sleep(0.05)
+            proceed.set()
+            voter.join(5)
+            closer.join(5)
+        self.assertEqual(closed[0].winner, "Song A")
+
+    def test_round_history_is_bounded(self):
+        MusicManager._instance = None
+        manager = MusicManager(history_size=3)
+        for _ in range(5):
+            manager.close_round()
+        self.assertListEqual([r.number for r in manager.round_history], [3, 4, 5])
+
+    def test_rounds_close_on_a_timer(self):
+        closed = threading.Event()
+
+        class RoundObserver(Observer):
+            def update(self, data):
+                if data["type"] == "round_closed":
+                    closed.set()
+
+        self.manager.add_observer(RoundObserver())
+        self.manager.cast_vote("Song A")
+        self.manager.start_rounds(0.05)
+        try:
+            self.assertTrue(closed.wait(timeout=2))
+        finally:
+            self.manager.stop_rounds()
+        self.assertEqual(self.manager.round_history[0].winner, "Song A")
+
+
+class TestLeaderboard(unittest.TestCase):
+    def test_top_rank_and_winner(self):
+        board = Leaderboard()
+        board.update("B", 2)
+        board.update("A", 2)
+        board.update("C", 1)
+        board.update("C", 3)
+        self.assertListEqual(board.top(2), [("C", 3), ("A", 2)])
+        self.assertEqual(board.rank("B"), 3)
+        self.assertIsNone(board.rank("D"))
+        self.assertEqual(board.winner(), "C")
+
+    def test_update_moves_song(self):
+        board = Leaderboard()
+        board.update("A", 5)
+        board.update("B", 4)
+        board.update("A", 3)
+        self.assertListEqual(board.top(5), [("B", 4), ("A", 3)])
+
+    def test_same_order_without_sortedcontainers(self):
+        with mock.patch("multiplayer.leaderboard.SortedList", None):
+            board = Leaderboard()
+        for song, votes in [("B", 2), ("A", 1), ("C", 1), ("C", 3), ("A", 2)]:
+            board.update(song, votes)
+        self.assertListEqual(board.top(3), [("C", 3), ("A", 2), ("B", 2)])
+        self.assertEqual(board.rank("B"), 3)
+
+    def test_manager_keeps_leaderboard_in_step_with_votes(self):
+        MusicManager._instance = None
+        manager = MusicManager.get_instance()
+        for song in ["X", "Y", "Y", "Z", "Y", "Z"]:
+            manager.cast_vote(song)
+        self.assertListEqual(manager.top(3), [("Y", 3), ("Z", 2), ("X", 1)])
+        self.assertEqual(manager.rank("Z"), 2)
+        self.assertEqual(manager.winner(), "Y")
+        self.assertIsNone(Leaderboard().winner())
+
 
 if __name__ == "__main__":
     unittest.main()
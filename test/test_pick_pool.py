@@ -0,0 +1,67 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, random
+from music.cooldown import Cooldown
+from music.pick_pool import PickPool
+from music.song import Song
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCooldown(unittest.TestCase):
+    def test_key_fires_once_per_period(self):
+        clock = FakeClock()
+        cooldown = Cooldown(10, clock)
+        self.assertTrue(cooldown.try_acquire("player"))
+        self.assertFalse(cooldown.try_acquire("player"))
+        self.assertTrue(cooldown.try_acquire("other player"))
+        clock.now += 4
+        self.assertAlmostEqual(cooldown.remaining("player"), 6)
+        clock.now += 6
+        self.assertEqual(cooldown.remaining("player"), 0)
+        self.assertTrue(cooldown.try_acquire("player"))
+
+
+class TestPickPool(unittest.TestCase):
+    def setUp(self):
+        self.songs = [Song(f"Song{i}", "Artist", "Pop", i, 1.0) for i in range(20)]
+        self.cached = {("Song1", "Artist"), ("Song2", "Artist"), ("Song3", "Artist")}
+        self.prefetched = []
+        self.pool = PickPool(
+            size=3,
+            is_cached=lambda title, artist: (title, artist) in self.cached,
+            prefetch=lambda owner, songs: self.prefetched.extend(songs),
+            rng=random.Random(4)
+        )
+
+    def test_refill_pools_cached_songs(self):
+        self.pool.refill(self.songs)
+        self.assertEqual(len(self.pool), 3)
+        self.assertIn(self.pool.take(), self.cached)
+        self.assertListEqual(self.prefetched, [])
+
+    def test_uncached_songs_are_prefetched(self):
+        self.cached = {("Song1", "Artist")}
+        self.pool.refill(self.songs)
+        self.assertLessEqual(len(self.pool), 1)
+        self.assertTrue(1 <= len(self.prefetched) <= 3)
+        self.assertTrue(all(pick not in self.cached for pick in self.prefetched))
+
+    def test_evicted_picks_are_skipped(self):
+        self.pool.refill(self.songs)
+        self.cached.clear()
+        self.assertIsNone(self.pool.take())
+
+    def test_empty_pool_returns_none(self):
+        self.assertIsNone(self.pool.take())
+
+
+if __name__ == "__main__":
+    unittest.main()
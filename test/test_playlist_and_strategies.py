@@ -8,6 +8,8 @@ from COMP303.myhouse import (  # <<-- absolute import via the package
     SortByPopularityStrategy,
     SortByUserRatingStrategy
 )
+from COMP303.music.catalog import PlaylistCatalog
+from COMP303.commands.playlist_commands import SongOptionSource
 
 
 class TestPlaylistAndStrategies(unittest.TestCase):
@@ -15,10 +17,10 @@ class TestPlaylistAndStrategies(unittest.TestCase):
         # Create a temp CSV file
         self.tmp = tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.csv')
         writer = csv.writer(self.tmp)
-        writer.writerow(["title", "genre", "popularity", "rating"])
-        writer.writerow(["Song1", "Rock", "50", "4.2"])
-        writer.writerow(["Song2", "Jazz", "75", "3.8"])
-        writer.writerow(["Song3", "Rock", "30", "4.9"])
+        writer.writerow(["title", "artist", "genre", "popularity", "userrating"])
+        writer.writerow(["Song1", "Artist1", "Rock", "50", "4.2"])
+        writer.writerow(["Song2", "Artist2", "Jazz", "75", "3.8"])
+        writer.writerow(["Song3", "Artist3", "Rock", "30", "4.9"])
         self.tmp.flush()
         self.tmp_path = self.tmp.name
 
@@ -29,26 +31,59 @@ class TestPlaylistAndStrategies(unittest.TestCase):
         playlist = Playlist(self.tmp_path)
         songs = playlist.load_songs()
         # should skip header
-        titles = [row[0] for row in songs]
+        titles = [song.title for song in songs]
         self.assertListEqual(titles, ["Song1","Song2","Song3"])
 
     def test_sort_by_genre(self):
         playlist = Playlist(self.tmp_path)
         result = playlist.sortPlaylist(SortByGenreStrategy())
         # Jazz comes before Rock
-        self.assertEqual(result[0][1], "Jazz")
+        self.assertEqual(result[0].genre, "Jazz")
 
     def test_sort_by_popularity(self):
         playlist = Playlist(self.tmp_path)
         result = playlist.sortPlaylist(SortByPopularityStrategy())
         # highest popularity 75 first
-        self.assertEqual(result[0][2], "75")
+        self.assertEqual(result[0].popularity, 75)
 
     def test_sort_by_rating(self):
         playlist = Playlist(self.tmp_path)
         result = playlist.sortPlaylist(SortByUserRatingStrategy())
         # highest rating 4.9 first
-        self.assertAlmostEqual(float(result[0][3]), 4.9)
+        self.assertAlmostEqual(result[0].rating, 4.9)
+
+    def test_windows_and_pages_match_full_sort(self):
+        playlist = Playlist(self.tmp_path)
+        indexed = PlaylistCatalog.get_instance().get_playlist(os.path.abspath(self.tmp_path))
+        for strategy in (SortByGenreStrategy(), SortByPopularityStrategy(), SortByUserRatingStrategy()):
+            full = [song.title for song in playlist.sortPlaylist(strategy)]
+            self.assertListEqual([song.title for song in playlist.sortWindow(strategy, 1, 3)], full[1:3])
+            self.assertListEqual([song.title for song in strategy.sort_page(indexed, 1, 2)], full[2:4])
+            self.assertListEqual(strategy.sort_window(indexed, 5, 9), [])
+
+    def test_sort_order_computed_once(self):
+        calls = []
+
+        class CountingStrategy(SortByPopularityStrategy):
+            def sort_key(self, song):
+                calls.append(song.title)
+                return super().sort_key(song)
+
+        playlist = Playlist(self.tmp_path)
+        strategy = CountingStrategy()
+        first_page = [song.title for song in playlist.sortWindow(strategy, 0, 2)]
+        self.assertListEqual(first_page, ["Song2", "Song1"])
+        self.assertEqual(len(calls), 3)
+        for _ in range(3):
+            self.assertListEqual([song.title for song in playlist.sortWindow(strategy, 0, 2)], first_page)
+        self.assertEqual(len(calls), 3)
+
+    def test_repeated_titles_get_distinct_labels(self):
+        with open(self.tmp_path, 'a', newline='') as f:
+            csv.writer(f).writerow(["Song1", "Artist4", "Pop", "10", "1.0"])
+        source = SongOptionSource(self.tmp_path)
+        self.assertListEqual(source[0:4], ["Song1 - Artist1", "Song2", "Song3", "Song1 - Artist4"])
+        self.assertEqual(source.command_at(3).selected_artist, "Artist4")
 
 if __name__ == "__main__":
     unittest.main()
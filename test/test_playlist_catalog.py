@@ -0,0 +1,139 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, csv, tempfile, threading
+from music.catalog import IndexedPlaylist, PlaylistCatalog, MERGE_BY_INSERTION_LIMIT
+from music.song import Song
+
+
+class TestPlaylistCatalog(unittest.TestCase):
+    def setUp(self):
+        # Reset singleton for each test
+        PlaylistCatalog._instance = None
+        self.catalog = PlaylistCatalog.get_instance()
+
+        self.tmp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='')
+        writer = csv.writer(self.tmp)
+        writer.writerow(["title", "artist", "genre", "popularity", "userrating"])
+        writer.writerow(["Song1", "Artist1", "Rock", "50", "4.2"])
+        writer.writerow(["Song2", "Artist2", "Jazz", "75", "3.8"])
+        self.tmp.close()
+        self.tmp_path = self.tmp.name
+
+    def tearDown(self):
+        os.unlink(self.tmp_path)
+
+    def test_concurrent_get_instance_creates_one_catalog(self):
+        PlaylistCatalog._instance = None
+        instances = []
+        start = threading.Barrier(8)
+
+        def get():
+            start.wait()
+            instances.append(PlaylistCatalog.get_instance())
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(instances), 8)
+        self.assertEqual(len({id(instance) for instance in instances}), 1)
+
+    def test_header_skipped(self):
+        songs = self.catalog.get_songs(self.tmp_path)
+        self.assertListEqual([song.title for song in songs], ["Song1", "Song2"])
+
+    def test_fields_parsed_once(self):
+        song = self.catalog.get_songs(self.tmp_path)[1]
+        self.assertEqual(song.popularity, 75)
+        self.assertAlmostEqual(song.rating, 3.8)
+        self.assertEqual(song.title_key, "song2")
+
+    def test_malformed_rows_skipped(self):
+        with open(self.tmp_path, 'a', newline='') as f:
+            csv.writer(f).writerow(["Broken", "Artist", "Pop", "lots", "1.0"])
+        self.assertEqual(len(self.catalog.get_songs(self.tmp_path)), 2)
+
+    def test_rows_shared_until_file_changes(self):
+        first = self.catalog.get_songs(self.tmp_path)
+        self.assertIs(first, self.catalog.get_songs(self.tmp_path))
+
+        with open(self.tmp_path, 'a', newline='') as f:
+            csv.writer(f).writerow(["Song3", "Artist3", "Pop", "10", "1.0"])
+
+        reloaded = self.catalog.get_songs(self.tmp_path)
+        self.assertIsNot(first, reloaded)
+        self.assertEqual(reloaded[-1].title, "Song3")
+
+    def test_find_by_title_and_artist(self):
+        with open(self.tmp_path, 'a', newline='') as f:
+            csv.writer(f).writerow(["song1", "Other Artist", "Pop", "10", "1.0"])
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        self.assertEqual(playlist.find(" SONG1 ").artist, "Artist1")
+        self.assertEqual(playlist.find("Song1", "other artist").artist, "Other Artist")
+        self.assertIsNone(playlist.find("Missing"))
+
+    def test_title_count(self):
+        with open(self.tmp_path, 'a', newline='') as f:
+            csv.writer(f).writerow(["song1", "Other Artist", "Pop", "10", "1.0"])
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        self.assertEqual(playlist.title_count("Song1"), 2)
+        self.assertEqual(playlist.title_count("Song2"), 1)
+        self.assertEqual(playlist.title_count("Missing"), 0)
+
+    def test_committed_song_updates_index_without_reload(self):
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        song = Song("New Song", "New Artist", "Pop", 5, 2.5)
+        self.catalog.add_song(self.tmp_path, song)
+        self.catalog.commit_songs(self.tmp_path, [song])
+        self.assertIs(playlist, self.catalog.get_playlist(self.tmp_path))
+        self.assertEqual(playlist.find("new song").popularity, 5)
+
+        # The row is persisted as well
+        self.catalog.invalidate()
+        self.assertEqual(self.catalog.get_songs(self.tmp_path)[-1].title, "New Song")
+
+    def test_append_to_file_without_trailing_newline(self):
+        with open(self.tmp_path, 'rb+') as f:
+            content = f.read().rstrip(b'\r\n')
+            f.seek(0)
+            f.write(content)
+            f.truncate()
+        self.catalog.commit_songs(self.tmp_path, [Song("New Song", "New Artist", "Pop", 5, 2.5)])
+
+        self.catalog.invalidate()
+        self.assertListEqual([song.title for song in self.catalog.get_songs(self.tmp_path)], ["Song1", "Song2", "New Song"])
+
+    def test_sort_order_cached_and_updated_on_append(self):
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        by_popularity = lambda song: -song.popularity
+        order = playlist.sort_order("popularity", by_popularity)
+        self.assertListEqual(order, [1, 0])
+        self.assertIs(order, playlist.sort_order("popularity", by_popularity))
+
+        self.catalog.add_song(self.tmp_path, Song("Song3", "Artist3", "Pop", 60, 1.0))
+        self.catalog.add_song(self.tmp_path, Song("Song4", "Artist4", "Pop", 75, 1.0))
+        # Ties keep playlist order
+        self.assertListEqual(playlist.sort_order("popularity", by_popularity), [1, 3, 2, 0])
+        # The order handed out earlier is left untouched
+        self.assertListEqual(order, [1, 0])
+
+    def test_sort_order_merges_large_batches(self):
+        by_popularity = lambda song: -song.popularity
+        playlist = IndexedPlaylist([Song(f"Song{i}", "Artist", "Pop", i % 7, 1.0) for i in range(20)])
+        playlist.sort_order("popularity", by_popularity)
+        for i in range(20, 20 + 2 * MERGE_BY_INSERTION_LIMIT):
+            playlist.append(Song(f"Song{i}", "Artist", "Pop", i % 7, 1.0))
+
+        expected = sorted(range(len(playlist)), key=lambda i: by_popularity(playlist.songs[i]))
+        self.assertListEqual(playlist.sort_order("popularity", by_popularity), expected)
+
+    def test_invalidate(self):
+        first = self.catalog.get_songs(self.tmp_path)
+        self.catalog.invalidate(self.tmp_path)
+        self.assertIsNot(first, self.catalog.get_songs(self.tmp_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
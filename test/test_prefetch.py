@@ -0,0 +1,86 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, threading, weakref
+from concurrent.futures import Future
+from music.prefetch import PrefetchScheduler
+from music.downloader import MAX_SPECULATIVE_WORKERS
+
+
+class TestPrefetchScheduler(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.fetched = []
+        self.cached = set()
+        self.scheduler = PrefetchScheduler(max_concurrent=1, fetch=self.fetch, is_cached=lambda t, a: (t, a) in self.cached)
+
+    def tearDown(self):
+        self.release.set()
+        self.scheduler.shutdown()
+
+    def fetch(self, title, artist):
+        self.fetched.append(title)
+        self.started.set()
+        self.release.wait(5)
+        future = Future()
+        future.set_result(f"{title} - {artist}.ogg")
+        return future
+
+    def test_default_workers_match_download_slots(self):
+        self.assertEqual(PrefetchScheduler().max_concurrent, MAX_SPECULATIVE_WORKERS)
+
+    def wait_until_idle(self):
+        for _ in range(500):
+            if not self.scheduler.pending("player"):
+                break
+            threading.Event().wait(0.01)
+
+    def test_scrolling_away_cancels_pending_songs(self):
+        self.scheduler.request("player", [("A", "x"), ("B", "x"), ("C", "x")])
+        self.assertTrue(self.started.wait(5))
+
+        # The player scrolls to the next page while "A" is still downloading
+        self.scheduler.request("player", [("D", "x")])
+        self.assertListEqual(self.scheduler.pending("player"), [("D", "x")])
+
+        self.release.set()
+        self.wait_until_idle()
+        self.scheduler.shutdown()
+        for worker in self.scheduler._workers:
+            worker.join(5)
+        self.assertListEqual(self.fetched, ["A", "D"])
+
+    def test_cached_songs_are_skipped(self):
+        self.release.set()
+        self.cached.add(("A", "x"))
+        self.scheduler.request("player", [("A", "x"), ("B", "x")])
+        self.wait_until_idle()
+        self.scheduler.shutdown()
+        for worker in self.scheduler._workers:
+            worker.join(5)
+        self.assertListEqual(self.fetched, ["B"])
+
+    def test_owners_are_independent(self):
+        self.scheduler.request("player", [("A", "x")])
+        self.assertTrue(self.started.wait(5))
+        self.scheduler.request("vote leaders", [("B", "x")])
+        self.scheduler.cancel("player")
+        self.assertListEqual(self.scheduler.pending("vote leaders"), [("B", "x")])
+
+    def test_owner_forgotten_once_nothing_is_pending(self):
+        class Owner:
+            pass
+
+        self.scheduler.request("player", [("A", "x")])
+        self.assertTrue(self.started.wait(5))
+        owner = Owner()
+        self.scheduler.request(owner, [("B", "x")])
+        self.scheduler.cancel(owner)
+        ref = weakref.ref(owner)
+        del owner
+        self.assertIsNone(ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
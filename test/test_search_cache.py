@@ -0,0 +1,77 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, tempfile, shutil
+from music.search_cache import ResolutionCache, SearchBackend
+
+
+class StubBackend(SearchBackend):
+    def __init__(self):
+        self.queries = []
+
+    def search(self, query):
+        self.queries.append(query)
+        return f"https://example.com/{len(self.queries)}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResolutionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, "search_results.jsonl")
+        self.backend = StubBackend()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def make_cache(self, **kwargs):
+        return ResolutionCache(self.cache_path, backend=self.backend, clock=self.clock, **kwargs)
+
+    def test_resolve_searches_once(self):
+        cache = self.make_cache()
+        first = cache.resolve("CN TOWER", "Drake")
+        self.assertEqual(cache.resolve("cn tower", "drake"), first)
+        self.assertListEqual(self.backend.queries, ["CN TOWER Drake audio"])
+
+    def test_results_persist_across_instances(self):
+        self.make_cache().resolve("CN TOWER", "Drake")
+        reloaded = self.make_cache()
+        self.assertEqual(reloaded.get("CN TOWER", "Drake"), "https://example.com/1")
+        self.assertEqual(len(self.backend.queries), 1)
+
+    def test_expired_entries_are_searched_again(self):
+        cache = self.make_cache(ttl=10)
+        cache.resolve("CN TOWER", "Drake")
+        self.clock.now += 10
+        self.assertIsNone(cache.get("CN TOWER", "Drake"))
+        cache.resolve("CN TOWER", "Drake")
+        self.assertEqual(len(self.backend.queries), 2)
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = self.make_cache(max_entries=2)
+        cache.put("A", "x", "url-a")
+        cache.put("B", "x", "url-b")
+        cache.get("A", "x")
+        cache.put("C", "x", "url-c")
+        self.assertIsNone(cache.get("B", "x"))
+        self.assertEqual(cache.get("A", "x"), "url-a")
+
+        # Compaction keeps the file bounded and consistent
+        for i in range(10):
+            cache.put(f"Song{i}", "x", f"url-{i}")
+        reloaded = self.make_cache(max_entries=2)
+        self.assertEqual(reloaded.get("Song9", "x"), "url-9")
+        with open(self.cache_path) as f:
+            self.assertLessEqual(len(f.readlines()), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
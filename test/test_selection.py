@@ -0,0 +1,92 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, random, weakref
+from collections import Counter
+from music.catalog import IndexedPlaylist
+from music.selection import AliasTable, ShuffleQueue, SongSelector
+from music.song import Song
+
+
+class FakePlayer:
+    pass
+
+
+class TestSongSelector(unittest.TestCase):
+    def setUp(self):
+        self.player = FakePlayer()
+        self.playlist = IndexedPlaylist([
+            Song("Song1", "Artist", "Pop", 0, 1.0),
+            Song("Song2", "Artist", "Pop", 30, 1.0),
+            Song("Song3", "Artist", "Pop", 70, 2.0),
+        ])
+
+    def test_same_seed_same_picks(self):
+        first = SongSelector(self.playlist, random.Random(42))
+        second = SongSelector(self.playlist, random.Random(42))
+        self.assertListEqual([first.uniform().title for _ in range(20)],
+                             [second.uniform().title for _ in range(20)])
+
+    def test_weighted_picks_follow_popularity(self):
+        selector = SongSelector(self.playlist, random.Random(1))
+        counts = Counter(selector.weighted("popularity").title for _ in range(10000))
+        self.assertEqual(counts["Song1"], 0)
+        self.assertAlmostEqual(counts["Song3"] / 10000, 0.7, delta=0.03)
+
+    def test_alias_table_with_zero_weights_is_uniform(self):
+        table = AliasTable([0, 0])
+        rng = random.Random(3)
+        counts = Counter(table.sample(rng) for _ in range(1000))
+        self.assertEqual(set(counts), {0, 1})
+
+    def test_weighted_table_rebuilt_after_append(self):
+        selector = SongSelector(self.playlist, random.Random(5))
+        selector.weighted("popularity")
+        self.playlist.append(Song("Song4", "Artist", "Pop", 10000, 1.0))
+        counts = Counter(selector.weighted("popularity").title for _ in range(100))
+        self.assertGreater(counts["Song4"], 90)
+
+    def test_shuffle_does_not_repeat_within_a_round(self):
+        selector = SongSelector(self.playlist, random.Random(7))
+        first_round = [selector.shuffled(self.player).title for _ in range(3)]
+        self.assertCountEqual(first_round, ["Song1", "Song2", "Song3"])
+        second_round = [selector.shuffled(self.player).title for _ in range(3)]
+        self.assertCountEqual(second_round, ["Song1", "Song2", "Song3"])
+
+    def test_shuffle_queue_grows_without_reshuffling(self):
+        queue = ShuffleQueue(5, random.Random(11))
+        played = [queue.next(), queue.next()]
+        remaining = list(queue.order)
+        queue.grow(7)
+        self.assertEqual(queue.size, 7)
+        self.assertListEqual([i for i in queue.order if i < 5], remaining)
+        rest = [queue.next() for _ in range(len(queue))]
+        self.assertCountEqual(played + rest, range(7))
+
+    def test_shuffle_picks_up_appended_songs_in_current_round(self):
+        selector = SongSelector(self.playlist, random.Random(9))
+        first = selector.shuffled(self.player).title
+        self.playlist.append(Song("Song4", "Artist", "Pop", 10, 1.0))
+        rest = [selector.shuffled(self.player).title for _ in range(3)]
+        self.assertCountEqual([first] + rest, ["Song1", "Song2", "Song3", "Song4"])
+
+    def test_shared_selector_per_playlist(self):
+        self.assertIs(SongSelector.get(self.playlist), SongSelector.get(self.playlist))
+
+    def test_shuffle_queue_dropped_with_player(self):
+        selector = SongSelector(self.playlist, random.Random(3))
+        selector.shuffled(self.player)
+        del self.player
+        self.assertEqual(len(selector._queues), 0)
+
+    def test_selector_dropped_with_playlist(self):
+        SongSelector.get(self.playlist).shuffled(self.player)
+        playlist_ref = weakref.ref(self.playlist)
+        selector_ref = weakref.ref(SongSelector.get(self.playlist))
+        del self.playlist
+        self.assertIsNone(playlist_ref())
+        self.assertIsNone(selector_ref())
+
+
+if __name__ == "__main__":
+    unittest.main()
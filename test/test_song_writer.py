@@ -0,0 +1,97 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, csv, tempfile, time
+from music.catalog import PlaylistCatalog
+from music.song_writer import SongWriteQueue, parse_song_entry
+from music.song import Song
+
+
+class TestSongWriteQueue(unittest.TestCase):
+    def setUp(self):
+        PlaylistCatalog._instance = None
+        self.catalog = PlaylistCatalog.get_instance()
+        # Long interval so only explicit flushes and full batches write
+        self.queue = SongWriteQueue(flush_interval=60, max_batch=1000)
+
+        self.tmp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='')
+        writer = csv.writer(self.tmp)
+        writer.writerow(["title", "artist", "genre", "popularity", "userrating"])
+        writer.writerow(["Song1", "Artist1", "Rock", "50", "4.2"])
+        self.tmp.close()
+        self.tmp_path = self.tmp.name
+
+    def tearDown(self):
+        self.queue.close()
+        os.unlink(self.tmp_path)
+
+    def read_titles(self):
+        with open(self.tmp_path, newline='') as f:
+            return [row[0] for row in csv.reader(f)][1:]
+
+    def test_submitted_song_visible_before_write(self):
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        self.queue.submit(self.tmp_path, Song("New", "Artist", "Pop", 5, 2.5))
+        self.assertEqual(self.catalog.get_playlist(self.tmp_path).find("New").artist, "Artist")
+        self.assertIs(self.catalog.get_playlist(self.tmp_path), playlist)
+        self.assertListEqual(self.read_titles(), ["Song1"])
+        self.assertEqual(self.queue.pending(), 1)
+        self.queue.flush()
+        self.assertListEqual(self.read_titles(), ["Song1", "New"])
+
+    def test_flush_writes_batch_without_reparsing(self):
+        playlist = self.catalog.get_playlist(self.tmp_path)
+        for i in range(1000 - 1):
+            self.queue.submit(self.tmp_path, Song(f"Bulk {i}", "Artist", "Pop", i, 1.0))
+        self.queue.flush()
+
+        titles = self.read_titles()
+        self.assertEqual(len(titles), 1000)
+        self.assertEqual(titles[-1], "Bulk 998")
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertIs(self.catalog.get_playlist(self.tmp_path), playlist)
+        self.assertEqual(len(playlist), 1000)
+
+    def test_flush_to_file_without_trailing_newline(self):
+        with open(self.tmp_path, 'rb+') as f:
+            content = f.read().rstrip(b'\r\n')
+            f.seek(0)
+            f.write(content)
+            f.truncate()
+        self.queue.submit(self.tmp_path, Song("New One", "Someone", "Pop", 10, 3.3))
+        self.queue.flush()
+
+        self.catalog.invalidate()
+        self.assertListEqual([song.title for song in self.catalog.get_songs(self.tmp_path)], ["Song1", "New One"])
+
+    def test_full_batch_written_in_background(self):
+        queue = SongWriteQueue(flush_interval=60, max_batch=3)
+        for i in range(3):
+            queue.submit(self.tmp_path, Song(f"Song{i + 2}", "Artist", "Pop", 1, 1.0))
+        for _ in range(200):
+            if queue.pending() == 0 and len(self.read_titles()) == 4:
+                break
+            time.sleep(0.01)
+        self.assertListEqual(self.read_titles(), ["Song1", "Song2", "Song3", "Song4"])
+        queue.close()
+
+    def test_close_writes_pending_songs_and_stops_worker(self):
+        self.queue.submit(self.tmp_path, Song("Last", "Artist", "Pop", 1, 1.0))
+        worker = self.queue._worker
+        self.queue.close()
+        self.assertFalse(worker.is_alive())
+        self.assertListEqual(self.read_titles(), ["Song1", "Last"])
+        with self.assertRaises(AssertionError):
+            self.queue.submit(self.tmp_path, Song("Late", "Artist", "Pop", 1, 1.0))
+
+    def test_parse_song_entry(self):
+        song = parse_song_entry(" CN TOWER , Drake, Pop, 100, 4.5")
+        self.assertEqual((song.title, song.popularity, song.rating), ("CN TOWER", 100, 4.5))
+        with self.assertRaises(ValueError):
+            parse_song_entry("only,three,fields")
+        with self.assertRaises(ValueError):
+            parse_song_entry("Song,Artist,Pop,lots,4.5")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import unittest, csv, tempfile
+from unittest import mock
+from COMP303.imports import HumanPlayer
+from COMP303.custom_computer import CustomComputer, DictOptionSource
+from COMP303.multiplayer.vote_command import VoteForSongCommand
+from COMP303.multiplayer.music_manager import MusicManager
+from COMP303.music.catalog import PlaylistCatalog
+from COMP303.music.prefetch import PrefetchScheduler
+
+
+class TestVoteMenu(unittest.TestCase):
+    def setUp(self):
+        # MenuMessage and ServerMessage are patched to return the options or text they were given
+        for target, replacement in [
+            ("COMP303.custom_computer.MenuMessage", lambda computer, player, name, options: options),
+            ("COMP303.multiplayer.vote_command.ServerMessage", lambda player, text: text),
+        ]:
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Reset singletons for each test; songs count as cached so nothing is downloaded
+        MusicManager._instance = None
+        PlaylistCatalog._instance = None
+        PrefetchScheduler._instance = PrefetchScheduler(is_cached=lambda title, artist: True)
+
+        self.tmp = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='')
+        writer = csv.writer(self.tmp)
+        writer.writerow(["title", "artist", "genre", "popularity", "userrating"])
+        writer.writerow(["Song1", "Artist1", "Rock", "50", "4.2"])
+        writer.writerow(["Song2", "Artist2", "Jazz", "75", "3.8"])
+        self.tmp.close()
+        self.tmp_path = self.tmp.name
+
+        self.computer = CustomComputer(menu_options=DictOptionSource({"Vote for Song": VoteForSongCommand(self.tmp_path)}))
+        self.player = HumanPlayer("voter")
+
+    def tearDown(self):
+        PrefetchScheduler._instance.shutdown()
+        PrefetchScheduler._instance = None
+        os.unlink(self.tmp_path)
+
+    def test_vote_from_menu(self):
+        menu = self.computer.select_option(self.player, "Vote for Song")
+        self.assertListEqual(menu[-1], ["Back", "Song1", "Song2"])
+
+        self.assertListEqual(self.computer.select_option(self.player, "Song2"), ["You voted for 'Song2'"])
+        self.assertDictEqual(MusicManager.get_instance().get_vote_counts(), {"Song2": 1})
+
+    def test_second_vote_in_a_round_is_refused(self):
+        self.computer.select_option(self.player, "Vote for Song")
+        self.computer.select_option(self.player, "Song2")
+
+        self.assertListEqual(self.computer.select_option(self.player, "Song1"),
+                             ["You already voted this round. Wait for the next one!"])
+        self.assertDictEqual(MusicManager.get_instance().get_vote_counts(), {"Song2": 1})
+
+        MusicManager.get_instance().close_round()
+        self.assertListEqual(self.computer.select_option(self.player, "Song1"), ["You voted for 'Song1'"])
+
+    def test_back_returns_to_main_menu(self):
+        self.computer.select_option(self.player, "Vote for Song")
+        self.assertListEqual(self.computer.select_option(self.player, "Back")[-1], ["Vote for Song"])
+
+    def test_empty_playlist(self):
+        with open(self.tmp_path, 'w', newline='') as f:
+            csv.writer(f).writerow(["title", "artist", "genre", "popularity", "userrating"])
+        self.assertListEqual(self.computer.select_option(self.player, "Vote for Song"), ["No songs available to vote for."])
+
+
+if __name__ == "__main__":
+    unittest.main()